@@ -1,16 +1,16 @@
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from app.database import RoutingSQLAlchemy
 import os
 from dotenv import load_dotenv
 
 
-db = SQLAlchemy()
-migrate = Migrate()
-load_dotenv()
+db = RoutingSQLAlchemy()
 
 
 def create_app(test_config=None):
+    # read .env once, before any configuration is taken from the environment
+    load_dotenv()
+
     app = Flask(__name__)
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
@@ -22,12 +22,89 @@ def create_app(test_config=None):
         app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
             "SQLALCHEMY_TEST_DATABASE_URI")
 
+    # database pool: sized per worker process (gunicorn.conf.py splits
+    # DATABASE_MAX_CONNECTIONS between its workers); "pgbouncer" leaves pooling
+    # to PgBouncer in transaction mode. Statement timeout is in milliseconds
+    app.config["DATABASE_POOL_PROFILE"] = os.environ.get("DATABASE_POOL_PROFILE", "default")
+    app.config["DATABASE_POOL_SIZE"] = int(os.environ.get("DATABASE_POOL_SIZE", 5))
+    app.config["DATABASE_MAX_OVERFLOW"] = int(os.environ.get("DATABASE_MAX_OVERFLOW", 10))
+    app.config["DATABASE_POOL_TIMEOUT"] = float(os.environ.get("DATABASE_POOL_TIMEOUT", 10))
+    app.config["DATABASE_POOL_RECYCLE"] = int(os.environ.get("DATABASE_POOL_RECYCLE", 1800))
+    app.config["DATABASE_POOL_PRE_PING"] = os.environ.get("DATABASE_POOL_PRE_PING", "1") != "0"
+    app.config["DATABASE_STATEMENT_TIMEOUT"] = int(os.environ.get("DATABASE_STATEMENT_TIMEOUT", 30000))
+    app.config["DATABASE_APPLICATION_NAME"] = os.environ.get("DATABASE_APPLICATION_NAME", "task-list-api")
+
+    # read replicas for the GET routes, comma separated; a client keeps reading
+    # from the primary for a few seconds after each of its writes
+    app.config["DATABASE_REPLICA_URIS"] = [
+        uri for uri in os.environ.get("DATABASE_REPLICA_URIS", "").split(",") if uri]
+    app.config["DATABASE_READ_YOUR_WRITES_SECONDS"] = int(os.environ.get("DATABASE_READ_YOUR_WRITES_SECONDS", 5))
+    app.config["DATABASE_REPLICA_CHECK_INTERVAL"] = float(os.environ.get("DATABASE_REPLICA_CHECK_INTERVAL", 5))
+    app.config["DATABASE_REPLICA_RETRY_SECONDS"] = float(os.environ.get("DATABASE_REPLICA_RETRY_SECONDS", 30))
+
+    # Slack notifications are delivered from the outbox by `flask dispatch-outbox`
+    app.config["SLACK_API_URL"] = os.environ.get(
+        "SLACK_API_URL", "https://slack.com/api/chat.postMessage")
+    app.config["SLACK_TIMEOUT"] = float(os.environ.get("SLACK_TIMEOUT", 5))
+    app.config["OUTBOX_CONCURRENCY"] = int(os.environ.get("OUTBOX_CONCURRENCY", 4))
+    app.config["OUTBOX_BATCH_SIZE"] = int(os.environ.get("OUTBOX_BATCH_SIZE", 50))
+    app.config["OUTBOX_MAX_ATTEMPTS"] = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 8))
+    app.config["OUTBOX_BACKOFF_BASE"] = float(os.environ.get("OUTBOX_BACKOFF_BASE", 2))
+    app.config["OUTBOX_BACKOFF_MAX"] = float(os.environ.get("OUTBOX_BACKOFF_MAX", 300))
+    app.config["OUTBOX_LEASE"] = float(os.environ.get("OUTBOX_LEASE", 60))
+    app.config["OUTBOX_POLL_INTERVAL"] = float(os.environ.get("OUTBOX_POLL_INTERVAL", 1))
+
+    # optional read-through cache behind retrieve_object: "local" for an
+    # in-process LRU, "redis" for a shared cache ("dict" is its local stand-in)
+    app.config["OBJECT_CACHE_BACKEND"] = os.environ.get("OBJECT_CACHE_BACKEND")
+    app.config["OBJECT_CACHE_URL"] = os.environ.get("OBJECT_CACHE_URL")
+    app.config["OBJECT_CACHE_TTL"] = int(os.environ.get("OBJECT_CACHE_TTL", 30))
+    app.config["OBJECT_CACHE_MAX_SIZE"] = int(os.environ.get("OBJECT_CACHE_MAX_SIZE", 10000))
+
+    # JSON encoder/decoder used by the routes: "stdlib" or "orjson"
+    app.config["JSON_BACKEND"] = os.environ.get("JSON_BACKEND", "stdlib")
+
+    # Flask-Migrate imports Alembic, which only the `flask db` commands need;
+    # gunicorn.conf.py turns it off for serving
+    app.config["MIGRATIONS_ENABLED"] = os.environ.get("MIGRATIONS_ENABLED", "1") != "0"
+
+    # Prometheus metrics at /metrics; with several worker processes, point
+    # METRICS_MULTIPROCESS_DIR at a directory shared by them to aggregate
+    app.config["METRICS_ENABLED"] = os.environ.get("METRICS_ENABLED", "1") != "0"
+    app.config["METRICS_MULTIPROCESS_DIR"] = os.environ.get("METRICS_MULTIPROCESS_DIR")
+    app.config["METRICS_FLUSH_INTERVAL"] = float(os.environ.get("METRICS_FLUSH_INTERVAL", 1))
+
+    if test_config is not None:
+        app.config.update(test_config)
+
+    from .database import build_engine_options, build_replica_binds
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", build_engine_options(app.config))
+    app.config["SQLALCHEMY_BINDS"] = {
+        **(app.config.get("SQLALCHEMY_BINDS") or {}), **build_replica_binds(app.config)}
+
     # Import models here for Alembic setup
     from app.models.task import Task
     from app.models.goal import Goal
+    from app.models.outbox_message import OutboxMessage
+    from app.models.collection_version import CollectionVersion
 
     db.init_app(app)
-    migrate.init_app(app, db)
+
+    from .database import init_replicas
+    init_replicas(app, db)
+
+    if app.config["MIGRATIONS_ENABLED"]:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+    from .cache import init_object_cache
+    init_object_cache(app)
+
+    from .serializers import init_json_backend
+    init_json_backend(app)
+
+    from .metrics import init_metrics
+    init_metrics(app)
 
     # Register Blueprints here
     from .routes import task_bp
@@ -36,4 +113,7 @@ def create_app(test_config=None):
     from .routes import goal_bp
     app.register_blueprint(goal_bp)
 
+    from .outbox import dispatch_outbox_command
+    app.cli.add_command(dispatch_outbox_command)
+
     return app
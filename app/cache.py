@@ -0,0 +1,185 @@
+from app import db
+from app.metrics import get_metrics
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+import pickle
+import threading
+import time
+
+
+class LocalCache:
+    # in-process LRU bounded by size, entries expire after ttl seconds
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, namespace, key):
+        key = (namespace, key)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, namespace, key, value):
+        # returns the number of entries evicted to make room
+        key = (namespace, key)
+        evicted = 0
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+
+        return evicted
+
+
+class SharedCache:
+    # cache kept in a shared key-value store such as Redis, so every worker
+    # sees the same entries
+    def __init__(self, backend, ttl, prefix="task-list"):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+        self.evictions = 0
+
+    def make_key(self, namespace, key):
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def get(self, namespace, key):
+        value = self.backend.get(self.make_key(namespace, key))
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    def set(self, namespace, key, value):
+        # the store evicts on its own and does not report it
+        self.backend.set(self.make_key(namespace, key), pickle.dumps(value), ex=self.ttl)
+        return 0
+
+
+class DictBackend:
+    # local stand-in for a Redis client, implementing the calls SharedCache uses
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value, expires_at = self.values.get(key, (None, None))
+            if expires_at is not None and expires_at < time.monotonic():
+                del self.values[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self.lock:
+            expires_at = time.monotonic() + ex if ex else None
+            self.values[key] = (value, expires_at)
+
+
+class ObjectCache:
+    # entries are keyed by the version of the model's collection, the one the
+    # ETag is built from: a write bumps the version, so every worker stops
+    # reading the old entries at once and they age out of the store
+    def __init__(self, store):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, Model, id, version):
+        values = self.store.get(Model.__tablename__, f"{version}:{id}")
+        self.record_lookup(values is not None)
+        if values is None:
+            return None
+
+        # rebuild the row as a persistent object without querying the database
+        model = Model(**values)
+        make_transient_to_detached(model)
+        return db.session.merge(model, load=False)
+
+    def set(self, model, version):
+        mapper = inspect(model).mapper
+        values = {column.key: getattr(model, column.key) for column in mapper.column_attrs}
+        id = mapper.primary_key_from_instance(model)[0]
+
+        evicted = self.store.set(model.__tablename__, f"{version}:{id}", values)
+        metrics = get_metrics()
+        if evicted and metrics is not None:
+            metrics.inc("task_list_object_cache_evictions_total", {}, evicted)
+
+    def record_lookup(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.inc("task_list_object_cache_lookups_total", {"result": "hit" if hit else "miss"})
+
+    def stats(self):
+        with self.lock:
+            hits, misses = self.hits, self.misses
+
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": self.store.evictions,
+            "hit_ratio": hits / lookups if lookups else 0.0
+        }
+
+
+def create_shared_backend(app):
+    backend = app.config["OBJECT_CACHE_BACKEND"]
+
+    if backend == "dict":
+        return DictBackend()
+
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("OBJECT_CACHE_BACKEND=redis requires the redis package")
+        return redis.Redis.from_url(app.config["OBJECT_CACHE_URL"])
+
+    raise ValueError(f"unknown OBJECT_CACHE_BACKEND {backend}")
+
+
+def init_object_cache(app):
+    backend = app.config["OBJECT_CACHE_BACKEND"]
+    ttl = app.config["OBJECT_CACHE_TTL"]
+
+    if not backend:
+        return
+    elif backend == "local":
+        store = LocalCache(app.config["OBJECT_CACHE_MAX_SIZE"], ttl)
+    else:
+        store = SharedCache(create_shared_backend(app), ttl)
+
+    app.extensions["object_cache"] = ObjectCache(store)
+
+
+def get_object_cache():
+    return current_app.extensions.get("object_cache")
+
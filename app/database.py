@@ -0,0 +1,217 @@
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy import SignallingSession, SQLAlchemy, get_state
+from sqlalchemy import event, exc, orm
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import NullPool, Pool
+import itertools
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_ONLY_METHODS = ("GET", "HEAD")
+
+
+class RoutingSession(SignallingSession):
+    # reads of a read-only request go to the replica chosen for the request;
+    # everything else, and any flush, uses the primary
+    def get_bind(self, mapper=None, clause=None):
+        replica = g.get("replica_bind") if has_request_context() else None
+        if replica is not None and not self._flushing:
+            return get_state(self.app).db.get_engine(self.app, bind=replica)
+
+        return super().get_bind(mapper, clause)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+def build_engine_options(config):
+    # SQLALCHEMY_ENGINE_OPTIONS for the configured database; applies to every bind
+    database_uri = config.get("SQLALCHEMY_DATABASE_URI")
+    if not database_uri:
+        return {}
+
+    dialect = make_url(database_uri).get_backend_name()
+
+    # SQLite has no server connections to pool; Flask-SQLAlchemy picks its pool
+    if dialect == "sqlite":
+        return {}
+
+    statement_timeout = config["DATABASE_STATEMENT_TIMEOUT"]
+    connect_args = {}
+    if dialect == "postgresql":
+        connect_args["application_name"] = config["DATABASE_APPLICATION_NAME"]
+
+    if config["DATABASE_POOL_PROFILE"] == "pgbouncer":
+        # PgBouncer in transaction mode does the pooling and hands each
+        # transaction any server connection: no client-side pool, and no
+        # session-level settings, so the timeout is set per transaction
+        options = {"poolclass": NullPool, "connect_args": connect_args}
+        if statement_timeout:
+            options["execution_options"] = {"local_statement_timeout": statement_timeout}
+        return options
+
+    if dialect == "postgresql" and statement_timeout:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout}"
+
+    return {
+        "pool_size": config["DATABASE_POOL_SIZE"],
+        "max_overflow": config["DATABASE_MAX_OVERFLOW"],
+        "pool_timeout": config["DATABASE_POOL_TIMEOUT"],
+        "pool_recycle": config["DATABASE_POOL_RECYCLE"],
+        "pool_pre_ping": config["DATABASE_POOL_PRE_PING"],
+        "connect_args": connect_args
+    }
+
+
+@event.listens_for(Engine, "begin")
+def set_local_statement_timeout(conn):
+    statement_timeout = conn.get_execution_options().get("local_statement_timeout")
+    if statement_timeout:
+        conn.execute(f"SET LOCAL statement_timeout = {int(statement_timeout)}")
+
+
+def get_pool_stats(engine):
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+
+    # only QueuePool keeps a fixed size with overflow
+    if hasattr(pool, "overflow"):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow())
+        })
+
+    return stats
+
+
+def dispose_engines(app, db):
+    # drop every pooled connection of the app's engines, e.g. in a forked worker
+    with app.app_context():
+        for bind in [None] + list(app.config.get("SQLALCHEMY_BINDS") or {}):
+            db.get_engine(app, bind).dispose()
+
+
+# a pooled connection opened by another process (e.g. the gunicorn master
+# before it forked) must not be used here: invalidate it on checkout
+@event.listens_for(Pool, "connect")
+def record_connection_pid(dbapi_connection, connection_record):
+    connection_record.info["pid"] = os.getpid()
+
+
+@event.listens_for(Pool, "checkout")
+def check_connection_pid(dbapi_connection, connection_record, connection_proxy):
+    pid = os.getpid()
+    owner = connection_record.info.get("pid", pid)
+    if owner != pid:
+        connection_record.connection = connection_proxy.connection = None
+        raise exc.DisconnectionError(f"connection belongs to process {owner}, not {pid}")
+
+
+class ReplicaRouter:
+    # picks a healthy replica per request in turn. A replica is probed with a
+    # pooled connection at most once per check interval, and one that fails
+    # is skipped for retry seconds, falling back to the next one or the primary
+    def __init__(self, binds, check_interval, retry_seconds):
+        self.binds = binds
+        self.check_interval = check_interval
+        self.retry_seconds = retry_seconds
+        self.rotation = itertools.count()
+        self.checked_at = {}
+        self.down_until = {}
+        self.lock = threading.Lock()
+
+    def mark_down(self, bind, error):
+        logger.warning("replica %s unavailable, reading from the primary: %s", bind, error)
+        with self.lock:
+            self.down_until[bind] = time.monotonic() + self.retry_seconds
+            self.checked_at.pop(bind, None)
+
+    def is_healthy(self, bind, get_engine):
+        now = time.monotonic()
+        if self.down_until.get(bind, 0) > now:
+            return False
+        if now - self.checked_at.get(bind, float("-inf")) < self.check_interval:
+            return True
+
+        try:
+            get_engine(bind).connect().close()
+        except exc.DBAPIError as error:
+            self.mark_down(bind, error)
+            return False
+
+        with self.lock:
+            self.checked_at[bind] = now
+        return True
+
+    def choose(self, get_engine):
+        start = next(self.rotation)
+        for i in range(len(self.binds)):
+            bind = self.binds[(start + i) % len(self.binds)]
+            if self.is_healthy(bind, get_engine):
+                return bind
+
+        return None
+
+
+def build_replica_binds(config):
+    return {f"replica_{i}": uri for i, uri in enumerate(config["DATABASE_REPLICA_URIS"])}
+
+
+def is_read_only_request():
+    return request.method in READ_ONLY_METHODS and request.blueprint in ("task", "goal")
+
+
+def route_request():
+    router = current_app.extensions["replicas"]
+
+    # read-your-writes: a client that just wrote keeps reading from the primary
+    try:
+        read_primary_until = float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        read_primary_until = 0
+
+    if not is_read_only_request() or read_primary_until > time.time():
+        return
+
+    db = get_state(current_app).db
+    g.replica_bind = router.choose(lambda bind: db.get_engine(current_app, bind=bind))
+
+
+def keep_writer_on_primary(response):
+    if is_read_only_request() or request.method == "OPTIONS" or response.status_code >= 400:
+        return response
+
+    seconds = current_app.config["DATABASE_READ_YOUR_WRITES_SECONDS"]
+    response.set_cookie(READ_PRIMARY_COOKIE, str(time.time() + seconds), max_age=seconds, httponly=True)
+    return response
+
+
+def init_replicas(app, db):
+    binds = sorted(build_replica_binds(app.config))
+    if not binds:
+        return
+
+    router = ReplicaRouter(binds, app.config["DATABASE_REPLICA_CHECK_INTERVAL"],
+        app.config["DATABASE_REPLICA_RETRY_SECONDS"])
+    app.extensions["replicas"] = router
+
+    # a replica that drops connections mid-request is skipped from then on
+    for bind in binds:
+        def on_error(context, bind=bind):
+            if context.is_disconnect:
+                router.mark_down(bind, context.original_exception)
+
+        event.listen(db.get_engine(app, bind=bind), "handle_error", on_error)
+
+    app.before_request(route_request)
+    app.after_request(keep_writer_on_primary)
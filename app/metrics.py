@@ -0,0 +1,348 @@
+from app import db
+from app.database import get_pool_stats
+from flask import Response, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import glob
+import json
+import os
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+METRICS = {
+    "task_list_http_requests_total": ("counter", "HTTP requests by route, method and status code", None),
+    "task_list_http_request_duration_seconds": ("histogram", "HTTP request latency", LATENCY_BUCKETS),
+    "task_list_sql_statements_per_request": ("histogram", "SQL statements executed per HTTP request",
+        STATEMENT_BUCKETS),
+    "task_list_db_duration_seconds": ("histogram", "Time spent executing SQL per HTTP request",
+        LATENCY_BUCKETS),
+    "task_list_pool_checkout_wait_seconds": ("histogram", "Time waiting for a pooled database connection",
+        POOL_WAIT_BUCKETS),
+    "task_list_slack_request_duration_seconds": ("histogram", "Slack API call latency by outcome",
+        LATENCY_BUCKETS),
+    "task_list_slack_failures_total": ("counter", "Slack API calls that did not deliver a message", None),
+    "task_list_object_cache_lookups_total": ("counter", "Object cache lookups by result, hit or miss", None),
+    "task_list_object_cache_evictions_total": ("counter", "Object cache entries evicted to stay within its size",
+        None)
+}
+
+# snapshot of every exited process, next to the files of the live ones
+AGGREGATE_SNAPSHOT = "metrics-aggregate.json"
+
+POOL_GAUGES = {
+    "task_list_db_pool_size": ("size", "Connections the pool keeps open"),
+    "task_list_db_pool_checked_in": ("checked_in", "Idle connections in the pool"),
+    "task_list_db_pool_checked_out": ("checked_out", "Connections in use"),
+    "task_list_db_pool_overflow": ("overflow", "Connections open beyond the pool size")
+}
+
+
+class Metrics:
+    # counters and histograms keyed by (name, labels); labels are a sorted tuple of pairs
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        buckets = METRICS[name][2]
+
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(buckets), 0.0, 0]
+
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[0][i] += 1
+                    break
+            histogram[1] += value
+            histogram[2] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                "histograms": [[name, list(labels), list(counts), total, count]
+                    for (name, labels), (counts, total, count) in self.histograms.items()]
+            }
+
+
+def merge_snapshots(snapshots):
+    counters = {}
+    histograms = {}
+
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+
+        for name, labels, counts, total, count in snapshot["histograms"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            merged = histograms.setdefault(key, [[0] * len(counts), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+
+    return counters, histograms
+
+
+def format_labels(labels, extra=()):
+    labels = list(labels) + list(extra)
+    if not labels:
+        return ""
+
+    escape = lambda value: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+def render(counters, histograms):
+    # Prometheus text exposition format, version 0.0.4
+    lines = []
+
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        if kind == "counter":
+            for (series, labels), value in sorted(counters.items()):
+                if series == name:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+            continue
+
+        for (series, labels), (counts, total, count) in sorted(histograms.items()):
+            if series != name:
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{name}_count{format_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def render_pool_stats(engines):
+    # gauges describe the pool of the process that serves the scrape
+    pid = ("pid", str(os.getpid()))
+    stats = {bind: get_pool_stats(engine) for bind, engine in engines.items()}
+    lines = []
+
+    for name, (key, help_text) in POOL_GAUGES.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for bind, bind_stats in sorted(stats.items()):
+            if key in bind_stats:
+                lines.append(f"{name}{format_labels([('bind', bind), pid])} {bind_stats[key]}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    # gunicorn workers do not share memory. With a multiprocess directory every
+    # process writes its snapshot to its own file and /metrics sums the files of
+    # all processes (clear the directory on deploy); gunicorn.conf.py folds the
+    # file of an exited worker into the aggregate file, so recycled workers do
+    # not pile up. Without one, each series carries a pid label so the workers'
+    # series never overwrite each other. Slack metrics come from the outbox
+    # dispatcher, so they only show up when it writes to the same directory.
+    def __init__(self, metrics, directory, flush_interval):
+        self.metrics = metrics
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.flushed_at = 0.0
+
+    def path(self):
+        return get_snapshot_path(self.directory, os.getpid())
+
+    def flush(self, force=False):
+        if not self.directory:
+            return
+
+        now = time.monotonic()
+        if not force and now - self.flushed_at < self.flush_interval:
+            return
+        self.flushed_at = now
+
+        write_snapshot(self.path(), self.metrics.snapshot())
+
+    def collect(self):
+        if not self.directory:
+            counters, histograms = merge_snapshots([self.metrics.snapshot()])
+            pid = (("pid", str(os.getpid())),)
+            return ({(name, labels + pid): value for (name, labels), value in counters.items()},
+                {(name, labels + pid): value for (name, labels), value in histograms.items()})
+
+        self.flush(force=True)
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            snapshot = read_snapshot(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+
+        return merge_snapshots(snapshots)
+
+
+def get_snapshot_path(directory, pid):
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def read_snapshot(path):
+    # the file of an exited process may be merged away between glob and open
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(path, snapshot):
+    temporary_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(snapshot, file)
+    os.replace(temporary_path, path)
+
+
+def merge_exited_process(directory, pid):
+    # called by the gunicorn master once a worker has exited
+    path = get_snapshot_path(directory, pid)
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return
+
+    aggregate_path = os.path.join(directory, AGGREGATE_SNAPSHOT)
+    snapshots = [snapshot]
+    aggregate = read_snapshot(aggregate_path)
+    if aggregate is not None:
+        snapshots.append(aggregate)
+
+    counters, histograms = merge_snapshots(snapshots)
+    write_snapshot(aggregate_path, {
+        "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+        "histograms": [[name, list(labels), counts, total, count]
+            for (name, labels), (counts, total, count) in histograms.items()]
+    })
+    os.remove(path)
+
+
+def get_metrics():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("metrics")
+
+
+def get_route_labels():
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    return {"route": route, "method": request.method}
+
+
+def start_request_timer():
+    g.metrics_started_at = time.perf_counter()
+    g.sql_statements = 0
+    g.db_time = 0.0
+
+
+def record_request(response):
+    metrics = get_metrics()
+    started_at = g.pop("metrics_started_at", None)
+    if started_at is None or request.endpoint == "metrics":
+        return response
+
+    labels = get_route_labels()
+    metrics.inc("task_list_http_requests_total", {**labels, "status": str(response.status_code)})
+    metrics.observe("task_list_http_request_duration_seconds", labels, time.perf_counter() - started_at)
+    metrics.observe("task_list_sql_statements_per_request", labels, g.sql_statements)
+    metrics.observe("task_list_db_duration_seconds", labels, g.db_time)
+    current_app.extensions["metrics_exporter"].flush()
+
+    return response
+
+
+def record_slack_call(app, elapsed, status):
+    metrics = app.extensions.get("metrics")
+    if metrics is None:
+        return
+
+    metrics.observe("task_list_slack_request_duration_seconds", {"outcome": status}, elapsed)
+    if status != "sent":
+        metrics.inc("task_list_slack_failures_total", {"outcome": status})
+    app.extensions["metrics_exporter"].flush()
+
+
+# SQL and pool events are registered once for every engine, including engines
+# recreated after dispose(); they only record while an app with metrics is active
+@event.listens_for(Engine, "before_cursor_execute")
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_statement_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["metrics_statement_started_at"].pop()
+    if has_request_context() and "sql_statements" in g:
+        g.sql_statements += 1
+        g.db_time += time.perf_counter() - started_at
+
+
+@event.listens_for(Engine, "handle_error")
+def discard_statement_timer(context):
+    if context.connection is not None:
+        timers = context.connection.info.get("metrics_statement_started_at")
+        if timers:
+            timers.pop()
+
+
+@event.listens_for(Engine, "engine_connect")
+def instrument_pool(conn, branch):
+    # the pool has no event for the start of a checkout, so its connect() is
+    # wrapped; dispose() replaces the pool and the new one is wrapped on first use
+    pool = conn.engine.pool
+    if getattr(pool, "metrics_instrumented", False):
+        return
+
+    connect = pool.connect
+
+    def timed_connect():
+        started_at = time.perf_counter()
+        connection = connect()
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.observe("task_list_pool_checkout_wait_seconds", {}, time.perf_counter() - started_at)
+        return connection
+
+    pool.connect = timed_connect
+    pool.metrics_instrumented = True
+
+
+def read_metrics():
+    counters, histograms = current_app.extensions["metrics_exporter"].collect()
+    engines = {bind: db.get_engine(bind=bind) for bind in current_app.config["SQLALCHEMY_BINDS"]}
+    engines["default"] = db.engine
+    body = render(counters, histograms) + render_pool_stats(engines)
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+
+def init_metrics(app):
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    metrics = Metrics()
+    app.extensions["metrics"] = metrics
+    app.extensions["metrics_exporter"] = MetricsExporter(
+        metrics, app.config["METRICS_MULTIPROCESS_DIR"], app.config["METRICS_FLUSH_INTERVAL"])
+
+    app.before_request(start_request_timer)
+    app.after_request(record_request)
+    app.add_url_rule("/metrics", "metrics", read_metrics)
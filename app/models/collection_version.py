@@ -0,0 +1,15 @@
+from app import db
+
+COLLECTIONS = ("task", "goal")
+
+
+class CollectionVersion(db.Model):
+    name = db.Column(db.String, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# bump_versions only updates, so every collection needs its row up front; the
+# migration seeds them in deployed databases, this listener after create_all
+@db.event.listens_for(CollectionVersion.__table__, "after_create")
+def seed_collection_versions(target, connection, **kw):
+    connection.execute(target.insert(), [{"name": name, "version": 0} for name in COLLECTIONS])
@@ -0,0 +1,14 @@
+from app import db
+import datetime
+
+
+class OutboxMessage(db.Model):
+    message_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    channel = db.Column(db.String, nullable=False)
+    text = db.Column(db.String, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow, index=True)
+    sent_at = db.Column(db.DateTime)
+    failed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.String)
@@ -2,9 +2,61 @@ from app import db
 
 
 class Task(db.Model):
+    __table_args__ = (
+        # (title, task_id) serves both sort directions and the keyset cursor
+        db.Index("ix_task_title_task_id", "title", "task_id"),
+        db.Index("ix_task_incomplete", "task_id",
+            postgresql_where=db.text("completed_at IS NULL"),
+            sqlite_where=db.text("completed_at IS NULL")),
+    )
+
     task_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String)
     description = db.Column(db.String)
-    completed_at = db.Column(db.DateTime)
-    goal_id = db.Column(db.Integer, db.ForeignKey('goal.goal_id'))
+    completed_at = db.Column(db.DateTime, index=True)
+    goal_id = db.Column(db.Integer, db.ForeignKey('goal.goal_id'), index=True)
     goal = db.relationship("Goal", back_populates="tasks")
+
+
+# title_prefix filters with LIKE 'prefix%', which PostgreSQL only serves from
+# an index with text_pattern_ops unless the database uses the C collation
+db.event.listen(Task.__table__, "after_create", db.DDL(
+    "CREATE INDEX ix_task_title_pattern ON task (title text_pattern_ops)"
+    ).execute_if(dialect="postgresql"))
+
+
+# full-text search index over title and description, kept in sync by the
+# database itself so every write path (ORM, bulk INSERT, set-based UPDATE and
+# DELETE) updates it: a generated tsvector column with a GIN index on
+# PostgreSQL, an external-content FTS5 table maintained by triggers on SQLite
+TASK_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+        "CREATE INDEX ix_task_search_vector ON task USING gin (search_vector)"
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE task_search USING fts5(title, description, "
+        "content='task', content_rowid='task_id', tokenize='porter unicode61')",
+        "CREATE TRIGGER task_search_insert AFTER INSERT ON task BEGIN "
+        "INSERT INTO task_search (rowid, title, description) "
+        "VALUES (new.task_id, new.title, new.description); END",
+        "CREATE TRIGGER task_search_delete AFTER DELETE ON task BEGIN "
+        "INSERT INTO task_search (task_search, rowid, title, description) "
+        "VALUES ('delete', old.task_id, old.title, old.description); END",
+        "CREATE TRIGGER task_search_update AFTER UPDATE OF title, description ON task BEGIN "
+        "INSERT INTO task_search (task_search, rowid, title, description) "
+        "VALUES ('delete', old.task_id, old.title, old.description); "
+        "INSERT INTO task_search (rowid, title, description) "
+        "VALUES (new.task_id, new.title, new.description); END"
+    ]
+}
+
+for dialect, statements in TASK_SEARCH_DDL.items():
+    for statement in statements:
+        db.event.listen(Task.__table__, "after_create", db.DDL(statement).execute_if(dialect=dialect))
+
+db.event.listen(Task.__table__, "before_drop", db.DDL(
+    "DROP TABLE IF EXISTS task_search"
+    ).execute_if(dialect="sqlite"))
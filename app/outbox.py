@@ -0,0 +1,179 @@
+from app import db
+from app.metrics import record_slack_call
+from app.models.outbox_message import OutboxMessage
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+import datetime
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    now = datetime.datetime.now(retry_at.tzinfo)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class OutboxDispatcher:
+    def __init__(self, app):
+        self.app = app
+        self.url = app.config["SLACK_API_URL"]
+        self.timeout = app.config["SLACK_TIMEOUT"]
+        self.batch_size = app.config["OUTBOX_BATCH_SIZE"]
+        self.max_attempts = app.config["OUTBOX_MAX_ATTEMPTS"]
+        self.backoff_base = app.config["OUTBOX_BACKOFF_BASE"]
+        self.backoff_max = app.config["OUTBOX_BACKOFF_MAX"]
+        self.lease = app.config["OUTBOX_LEASE"]
+        self.poll_interval = app.config["OUTBOX_POLL_INTERVAL"]
+        self.stopped = threading.Event()
+
+        # requests is imported here so the web workers, which only register
+        # the dispatch-outbox command, never load it
+        import requests
+
+        # bounded concurrency: at most this many Slack calls are in flight
+        concurrency = app.config["OUTBOX_CONCURRENCY"]
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.session = requests.Session()
+        self.session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+
+    def send(self, message):
+        started_at = time.perf_counter()
+        result = self.deliver(message)
+        record_slack_call(self.app, time.perf_counter() - started_at, result[1])
+        return result
+
+    def deliver(self, message):
+        import requests
+
+        message_id, channel, text = message
+        api_key = "Bearer " + os.environ.get("SLACK_BOT_USER_OAUTH_TOKEN", "")
+        headers = {"Authorization": api_key}
+        message_info = {"channel": channel, "text": text}
+
+        try:
+            r = self.session.post(self.url, params=message_info, headers=headers, timeout=self.timeout)
+        except requests.RequestException as error:
+            return message_id, "retry", None, repr(error)
+
+        if r.status_code == 429 or r.status_code >= 500:
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            return message_id, "retry", retry_after, f"HTTP {r.status_code}"
+        if r.status_code >= 400:
+            return message_id, "failed", None, f"HTTP {r.status_code}"
+
+        try:
+            response_body = r.json()
+        except ValueError:
+            return message_id, "retry", None, "invalid response body"
+
+        if not response_body.get("ok"):
+            return message_id, "retry", None, response_body.get("error")
+
+        return message_id, "sent", None, None
+
+    def backoff(self, attempts):
+        return min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+
+    def claim(self):
+        now = datetime.datetime.utcnow()
+
+        # lock the due rows, push their next attempt past the lease and commit,
+        # so concurrent dispatchers never send the same message twice
+        messages = (OutboxMessage.query
+            .filter(OutboxMessage.sent_at.is_(None))
+            .filter(OutboxMessage.failed_at.is_(None))
+            .filter(OutboxMessage.next_attempt_at <= now)
+            .order_by(OutboxMessage.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all())
+
+        claimed = []
+        for message in messages:
+            message.next_attempt_at = now + datetime.timedelta(seconds=self.lease)
+            claimed.append((message.message_id, message.channel, message.text))
+
+        db.session.commit()
+
+        return claimed
+
+    def drain(self):
+        claimed = self.claim()
+        if not claimed:
+            return 0
+
+        results = list(self.executor.map(self.send, claimed))
+
+        ids = [message_id for message_id, _, _, _ in results]
+        messages = OutboxMessage.query.filter(OutboxMessage.message_id.in_(ids))
+        messages = {message.message_id: message for message in messages}
+        now = datetime.datetime.utcnow()
+
+        for message_id, status, retry_after, error in results:
+            message = messages[message_id]
+            message.attempts += 1
+            message.last_error = error
+
+            if status == "sent":
+                message.sent_at = now
+            elif status == "failed" or message.attempts >= self.max_attempts:
+                message.failed_at = now
+                logger.warning("giving up on outbox message %s: %s", message_id, error)
+            else:
+                delay = max(self.backoff(message.attempts), retry_after or 0)
+                message.next_attempt_at = now + datetime.timedelta(seconds=delay)
+
+        db.session.commit()
+
+        return len(results)
+
+    def run(self):
+        while not self.stopped.is_set():
+            with self.app.app_context():
+                try:
+                    sent = self.drain()
+                except Exception:
+                    logger.exception("outbox dispatch failed")
+                    db.session.rollback()
+                    sent = 0
+
+            if not sent:
+                self.stopped.wait(self.poll_interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.executor.shutdown()
+        self.session.close()
+
+
+@click.command("dispatch-outbox")
+@with_appcontext
+def dispatch_outbox_command():
+    """Deliver queued Slack notifications from the outbox."""
+    dispatcher = OutboxDispatcher(current_app._get_current_object())
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        dispatcher.stop()
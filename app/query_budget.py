@@ -0,0 +1,50 @@
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def query_budget(limit):
+    # caps the SQL statements a view may run, so a query count that grows with
+    # the input (an N+1) is caught instead of shipping; statements run while a
+    # streamed body is generated happen after the view returns and are not counted
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            g.query_budget_statements = []
+            try:
+                response = view(*args, **kwargs)
+            finally:
+                statements = g.pop("query_budget_statements")
+
+            check_query_budget(view.__name__, limit, statements)
+            return response
+
+        wrapper.query_budget = limit
+        return wrapper
+
+    return decorator
+
+
+def check_query_budget(name, limit, statements):
+    if len(statements) <= limit:
+        return
+
+    message = f"{name} ran {len(statements)} SQL statements, its budget is {limit}"
+    if current_app.testing:
+        raise QueryBudgetExceeded(message + ":\n" + "\n".join(statements))
+
+    logger.warning("%s:\n%s", message, "\n".join(statements))
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "query_budget_statements" in g:
+        g.query_budget_statements.append(statement)
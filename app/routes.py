@@ -1,22 +1,41 @@
 from app import db
 from app.models.task import Task
 from app.models.goal import Goal
-from flask import Blueprint, jsonify, abort, make_response, request
-from sqlalchemy import desc
+from app.models.outbox_message import OutboxMessage
+from app.models.collection_version import CollectionVersion
+from app import cache
+from app.query_budget import query_budget
+from app.search import search_tasks
+from app.serializers import (get_json_backend, get_json_body, json_response, serialize_goal,
+    serialize_task, serialize_task_detail, serialize_task_with_goal)
+from flask import Blueprint, Response, abort, g, make_response, request, stream_with_context
+from sqlalchemy import desc, and_, func, literal, tuple_
+import base64
 import datetime
-import requests
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+import hashlib
+import json
 
 task_bp = Blueprint("task", __name__, url_prefix="/tasks")
 goal_bp = Blueprint("goal", __name__, url_prefix="/goals")
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+BULK_INSERT_CHUNK_SIZE = 1000
+TASK_FILTERS = ("is_complete", "goal_id", "completed_before", "completed_after", "title_prefix")
+MAX_BULK_TASKS = 100000
+DEFAULT_INCLUDED_TASKS = 100
+MAX_INCLUDED_TASKS = 1000
+MAX_NOTIFIED_TITLES = 10
+
 def validate_id(id):
+    # ids come from the URL as strings and from JSON bodies as numbers; null,
+    # booleans, floats, lists and objects are not ids
     try:
+        if isinstance(id, (bool, float)):
+            raise ValueError(id)
         id = int(id)
-    except ValueError:
+    except (TypeError, ValueError):
         abort(make_response({"error": f"{id} is an invalid ID. ID must be an integer."}, 400))
     
     return id
@@ -26,80 +45,601 @@ def retrieve_object(id, Model):
         model_type = "task"
     elif Model == Goal:
         model_type = "goal"
+
+    # read through the object cache when one is configured; entries are
+    # keyed by the collection version check_etag read, and routes that did
+    # not read it always go to the database
+    object_cache = cache.get_object_cache()
+    version = g.get("collection_versions", {}).get(model_type)
+    if object_cache is not None and version is not None:
+        model = object_cache.get(Model, id, version)
+        if model is not None:
+            return model
     
     model = Model.query.get(id)
 
     if not model:
         abort(make_response({"error": f"{model_type} {id} not found"}, 404))
+
+    if object_cache is not None and version is not None:
+        object_cache.set(model, version)
     
     return model
 
-def create_task_response_body(task):
-    if task.goal_id:
-        response_body = {
-            "task": {
-                "id": task.task_id,
-                "goal_id": task.goal_id,
-                "title": task.title,
-                "description": task.description,
-                "is_complete": bool(task.completed_at)
-                }
-        }
+def bump_versions(*names):
+    # every write bumps the version of the collections it changes in the same
+    # transaction, which invalidates the ETags of all reads built from them;
+    # the rows are seeded up front, so concurrent first writes never race to
+    # insert them
+    for name in names:
+        CollectionVersion.query.filter_by(name=name).update(
+            {CollectionVersion.version: CollectionVersion.version + 1}, synchronize_session=False)
+
+def check_etag(*names):
+    # the ETag comes from the collection versions rather than from the body,
+    # so an unchanged resource is answered with 304 before the real query runs
+    versions = db.session.query(CollectionVersion.name, CollectionVersion.version).filter(
+        CollectionVersion.name.in_(names))
+    versions = dict(versions)
+    g.collection_versions = {name: versions.get(name, 0) for name in names}
+
+    key = [request.full_path, request.headers.get("Accept", "")]
+    key.extend(f"{name}:{versions.get(name, 0)}" for name in names)
+    etag = hashlib.sha1("|".join(key).encode()).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        abort(make_response("", 304, create_etag_headers(etag)))
+
+    return etag
+
+def create_etag_headers(etag):
+    # the same URL serves JSON or NDJSON depending on Accept, which is part of
+    # the ETag; shared caches must key on it too
+    return {"ETag": f'"{etag}"', "Vary": "Accept"}
+
+def update_object(id, Model, values):
+    # one UPDATE ... RETURNING round trip instead of a SELECT then an UPDATE;
+    # SQLAlchemy 1.3 cannot emit RETURNING for SQLite, which updates then reads
+    table = Model.__table__
+    primary_key = table.primary_key.columns.values()[0]
+    statement = table.update().where(primary_key == id).values(values)
+
+    if supports_returning():
+        row = db.session.execute(statement.returning(*table.columns)).first()
+    elif db.session.execute(statement).rowcount:
+        row = db.session.execute(table.select().where(primary_key == id)).first()
+    else:
+        row = None
+
+    if row is None:
+        abort(make_response({"error": f"{Model.__tablename__} {id} not found"}, 404))
+
+    return row
+
+def delete_object(id, Model):
+    # DELETE ... RETURNING title, with the same SQLite fallback as update_object
+    table = Model.__table__
+    primary_key = table.primary_key.columns.values()[0]
+    statement = table.delete().where(primary_key == id)
+
+    if supports_returning():
+        row = db.session.execute(statement.returning(table.c.title)).first()
     else:
-        response_body = {
-            "task": {
-                "id": task.task_id,
-                "title": task.title,
-                "description": task.description,
-                "is_complete": bool(task.completed_at)
-                }
+        row = db.session.execute(db.select([table.c.title]).where(primary_key == id)).first()
+        if row is not None:
+            db.session.execute(statement)
+
+    if row is None:
+        abort(make_response({"error": f"{Model.__tablename__} {id} not found"}, 404))
+
+    return row.title
+
+def update_tasks(tasks, values):
+    # one set-based UPDATE of every task the bulk query selects, returning the
+    # updated rows; SQLite selects the ids first, since the filter may no
+    # longer match once the rows are updated
+    table = Task.__table__
+    statement = table.update().values(values)
+
+    if supports_returning():
+        if tasks.whereclause is not None:
+            statement = statement.where(tasks.whereclause)
+        result = db.session.execute(statement.returning(*table.columns))
+        return sorted(result, key=lambda row: row.task_id)
+
+    task_ids = [task_id for task_id, in tasks.with_entities(Task.task_id)]
+    if not task_ids:
+        return []
+
+    db.session.execute(statement.where(table.c.task_id.in_(task_ids)))
+    return db.session.execute(table.select().where(table.c.task_id.in_(task_ids)).order_by(table.c.task_id)).fetchall()
+
+def retrieve_task_ids(task_ids):
+    # validate every id, then check they all exist with a single IN query
+    task_ids = list(dict.fromkeys(validate_id(task_id) for task_id in task_ids))
+    if not task_ids:
+        return task_ids
+
+    found = db.session.query(Task.task_id).filter(Task.task_id.in_(task_ids))
+    found = {task_id for task_id, in found}
+    missing = [task_id for task_id in task_ids if task_id not in found]
+
+    if len(missing) == 1:
+        abort(make_response({"error": f"task {missing[0]} not found"}, 404))
+    elif missing:
+        missing = ", ".join(str(task_id) for task_id in missing)
+        abort(make_response({"error": f"tasks {missing} not found"}, 404))
+
+    return task_ids
+
+def supports_returning():
+    return db.session.get_bind().dialect.name == "postgresql"
+
+def read_bulk_request_body():
+    # bulk routes take a JSON array, or one JSON object per line as NDJSON
+    if request.mimetype == "application/x-ndjson":
+        try:
+            loads = get_json_backend().loads
+            return [loads(line) for line in request.get_data().splitlines() if line.strip()]
+        except ValueError:
+            abort(make_response({"details": "Invalid data"}, 400))
+
+    request_body = get_json_body(silent=True)
+    if not isinstance(request_body, list):
+        abort(make_response({"details": "Expected list of tasks"}, 400))
+
+    return request_body
+
+def validate_task_row(task_data):
+    if not isinstance(task_data, dict):
+        return None, "expected a task object"
+
+    try:
+        row = {
+            "title": task_data["title"],
+            "description": task_data["description"],
+            "completed_at": None
         }
-    return response_body
+    except KeyError as missing:
+        return None, f"missing {missing.args[0]}"
+
+    for name in ("title", "description"):
+        if row[name] is not None and not isinstance(row[name], str):
+            return None, f"{name} must be a string"
+
+    completed_at = task_data.get("completed_at")
+    if completed_at is not None:
+        from dateutil import parser as date_parser
+        try:
+            row["completed_at"] = date_parser.parse(completed_at)
+        except (TypeError, ValueError, OverflowError):
+            return None, f"{completed_at} is an invalid completed_at date"
+
+    return row, None
+
+def insert_tasks(rows):
+    table = Task.__table__
+    task_ids = []
+
+    # one multi-row INSERT per chunk instead of one statement per task
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_INSERT_CHUNK_SIZE]
+
+        if supports_returning():
+            result = db.session.execute(table.insert().values(chunk).returning(table.c.task_id))
+            task_ids.extend(task_id for task_id, in result)
+        else:
+            # SQLite assigns consecutive rowids within the statement, ending at lastrowid
+            result = db.session.execute(table.insert().values(chunk))
+            task_ids.extend(range(result.lastrowid - len(chunk) + 1, result.lastrowid + 1))
+
+    return task_ids
+
+def build_task_filters(filters):
+    if not isinstance(filters, dict):
+        abort(make_response({"details": "Expected filter object"}, 400))
+
+    unknown = sorted(set(filters) - set(TASK_FILTERS))
+    if unknown:
+        abort(make_response({"details": f"Unknown filter {unknown[0]}"}, 400))
+
+    clauses = []
+
+    if "goal_id" in filters:
+        goal_id = filters["goal_id"]
+        if goal_id is None:
+            clauses.append(Task.goal_id.is_(None))
+        else:
+            clauses.append(Task.goal_id == validate_id(goal_id))
+
+    if "is_complete" in filters:
+        is_complete = filters["is_complete"]
+        if not isinstance(is_complete, bool):
+            abort(make_response({"details": "is_complete must be true or false"}, 400))
+        if is_complete:
+            clauses.append(Task.completed_at.isnot(None))
+        else:
+            clauses.append(Task.completed_at.is_(None))
+
+    if "completed_before" in filters:
+        clauses.append(Task.completed_at < parse_filter_date("completed_before", filters["completed_before"]))
+
+    if "completed_after" in filters:
+        clauses.append(Task.completed_at > parse_filter_date("completed_after", filters["completed_after"]))
+
+    if "title_prefix" in filters:
+        title_prefix = filters["title_prefix"]
+        if not isinstance(title_prefix, str):
+            abort(make_response({"details": "title_prefix must be a string"}, 400))
+        clauses.append(build_title_prefix_clause(title_prefix))
+
+    return clauses
+
+def parse_filter_date(name, value):
+    # dateutil is only imported by the requests that parse dates
+    from dateutil import parser as date_parser
+    try:
+        return date_parser.parse(value)
+    except (TypeError, ValueError, OverflowError):
+        abort(make_response({"details": f"{value} is an invalid {name} date"}, 400))
+
+def build_title_prefix_clause(title_prefix):
+    # case-sensitive prefix match that can use a title index: GLOB on SQLite
+    # uses the (title, task_id) index, LIKE on PostgreSQL uses ix_task_title_pattern
+    if db.session.get_bind().dialect.name == "sqlite":
+        escaped = "".join(f"[{char}]" if char in "*?[" else char for char in title_prefix)
+        return Task.title.op("GLOB")(escaped + "*")
+
+    escaped = title_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return Task.title.like(escaped + "%", escape="\\")
+
+def get_task_filters():
+    # query string values are strings; convert them to the types the filters expect
+    filters = {}
+
+    for name in TASK_FILTERS:
+        if name in request.args:
+            filters[name] = request.args[name]
+
+    if "is_complete" in filters:
+        is_complete = filters["is_complete"].lower()
+        if is_complete not in ("true", "false"):
+            abort(make_response({"details": "is_complete must be true or false"}, 400))
+        filters["is_complete"] = is_complete == "true"
+
+    return build_task_filters(filters)
+
+def build_bulk_task_query(request_body):
+    # bulk routes select tasks by an id list, a filter, or explicitly all tasks
+    if not isinstance(request_body, dict):
+        abort(make_response({"details": "Invalid data"}, 400))
+
+    if "task_ids" in request_body:
+        task_ids = request_body["task_ids"]
+        if not isinstance(task_ids, list):
+            abort(make_response({"details": "Expected list of task ids"}, 400))
+        task_ids = [validate_id(task_id) for task_id in task_ids]
+        return Task.query.filter(Task.task_id.in_(task_ids))
+
+    if request_body.get("filter"):
+        return Task.query.filter(*build_task_filters(request_body["filter"]))
+
+    if request_body.get("all") is True:
+        return Task.query
+
+    abort(make_response({"details": "Expected task_ids, filter or all"}, 400))
+
+def get_page_size():
+    limit = request.args.get("limit")
+
+    # unpaginated listing is only available when explicitly requested
+    if limit == "all":
+        return None
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        abort(make_response({"error": f"{limit} is an invalid limit. Limit must be an integer or 'all'."}, 400))
+
+    if limit < 1:
+        abort(make_response({"error": f"{limit} is an invalid limit. Limit must be at least 1."}, 400))
+
+    return min(limit, MAX_PAGE_SIZE)
+
+def encode_cursor(sort, values):
+    cursor = json.dumps({"sort": sort, "values": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+def decode_cursor(cursor, sort, columns):
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = cursor["values"]
+        cursor_sort = cursor["sort"]
+    except (ValueError, TypeError, KeyError):
+        abort(make_response({"error": "invalid cursor"}, 400))
+
+    # a cursor is only valid for the ordering it was issued for, with a value
+    # of the right type for every column
+    if cursor_sort != sort or not isinstance(values, list) or len(values) != len(columns):
+        abort(make_response({"error": "invalid cursor"}, 400))
+
+    if not all(is_cursor_value(column, value) for column, value in zip(columns, values)):
+        abort(make_response({"error": "invalid cursor"}, 400))
+
+    return values
+
+def is_cursor_value(column, value):
+    if value is None:
+        return is_nullable(column)
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        # untyped SQL functions, such as the search rank, return numbers
+        python_type = float
+
+    if python_type is float:
+        return type(value) in (int, float)
+    return type(value) is python_type
+
+def is_nullable(column):
+    # computed columns, such as the search rank, carry no nullability and are
+    # never NULL
+    return getattr(column, "nullable", False)
+
+def order_column(column, descending):
+    # NULLs sort after every value ascending and before them descending on
+    # every dialect, which is PostgreSQL's default and matches its indexes
+    if not is_nullable(column):
+        return desc(column) if descending else column
+    return desc(column).nullsfirst() if descending else column.asc().nullslast()
+
+def build_keyset_clause(columns, values, descending):
+    # the rows after values in the order of columns, as one row-value
+    # comparison the index can use as the start of a range scan
+    values = [literal(value, column.type) for column, value in zip(columns, values)]
+    if len(columns) == 1:
+        columns, values = columns[0], values[0]
+    else:
+        columns, values = tuple_(*columns), tuple_(*values)
+
+    return columns < values if descending else columns > values
+
+def build_keyset_segments(columns, values, descending):
+    # (filter, ordering) of every part of the keyset order from the cursor on.
+    # Only the first column may be NULL; its NULL rows are their own segment,
+    # ordered by the remaining columns, so neither part needs an OR the index
+    # cannot use
+    ordering = [desc(column) if descending else column for column in columns]
+    if not is_nullable(columns[0]):
+        return [(build_keyset_clause(columns, values, descending) if values else None, ordering)]
+
+    value_segment = (columns[0].isnot(None), ordering)
+    null_segment = (columns[0].is_(None), ordering[1:])
+    segments = [null_segment, value_segment] if descending else [value_segment, null_segment]
+
+    if not values:
+        return segments
+
+    if values[0] is None:
+        start = (and_(null_segment[0], build_keyset_clause(columns[1:], values[1:], descending)), ordering[1:])
+        return [start] + segments[segments.index(null_segment) + 1:]
+
+    start = (build_keyset_clause(columns, values, descending), ordering)
+    return [start] + segments[segments.index(value_segment) + 1:]
+
+def paginate(query, columns, sort=None):
+    # keyset pagination: the cursor holds the ordering values of the last row
+    # of the previous page, so every page is an index range scan of the same cost
+    descending = sort == "desc"
+
+    limit = get_page_size()
+    if limit is None:
+        return query.order_by(*[order_column(column, descending) for column in columns]).all(), None
+
+    cursor = request.args.get("cursor")
+    values = decode_cursor(cursor, sort, columns) if cursor else None
+
+    # fetch one extra row to know whether another page exists; a page that
+    # reaches the end of one segment continues at the start of the next
+    items = []
+    for clause, ordering in build_keyset_segments(columns, values, descending):
+        segment = query if clause is None else query.filter(clause)
+        items.extend(segment.order_by(*ordering).limit(limit + 1 - len(items)))
+        if len(items) > limit:
+            break
+
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    next_cursor = encode_cursor(sort, [getattr(last, column.key) for column in columns])
+
+    return items, next_cursor
+
+def create_pagination_headers(next_cursor):
+    if not next_cursor:
+        return {}
+
+    return {"X-Next-Cursor": next_cursor}
+
+def get_stream_mode():
+    if request.args.get("stream") in ("1", "true"):
+        return "json"
+
+    best_match = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+    if best_match == "application/x-ndjson":
+        return "ndjson"
+
+    return None
+
+def stream_response(mode, query, create_item, envelope=None, headers=None):
+    # yield_per fetches rows in batches through a server-side cursor, so
+    # neither the ORM objects nor the serialized body are held in memory at once
+    rows = query.yield_per(STREAM_BATCH_SIZE)
+    dumps = get_json_backend().dumps
+
+    def generate_ndjson():
+        for row in rows:
+            yield dumps(create_item(row)) + b"\n"
+
+    def generate_json():
+        if envelope is None:
+            yield b"["
+        else:
+            yield dumps(envelope)[:-1] + b',"tasks":['
+
+        for i, row in enumerate(rows):
+            yield (b"," if i else b"") + dumps(create_item(row))
+
+        yield b"]" if envelope is None else b"]}"
+
+    if mode == "ndjson":
+        return Response(stream_with_context(generate_ndjson()), mimetype="application/x-ndjson", headers=headers)
+
+    return Response(stream_with_context(generate_json()), mimetype="application/json", headers=headers)
+
+def create_task_response_body(task):
+    return {"task": serialize_task_detail(task)}
+
+# list routes select plain column rows instead of ORM instances, which skips
+# identity map and instance construction for every row
+def query_task_summaries():
+    return db.session.query(Task.task_id, Task.title, Task.description, Task.completed_at)
+
+def query_goal_task_summaries(goal_id):
+    return db.session.query(
+        Task.task_id, Task.goal_id, Task.title, Task.description, Task.completed_at
+        ).filter(Task.goal_id == goal_id)
+
+def query_goal_summaries():
+    return db.session.query(Goal.goal_id, Goal.title)
+
+def includes_tasks():
+    include = request.args.get("include")
+    if include is None:
+        return False
+    if include != "tasks":
+        abort(make_response({"error": f"{include} cannot be included. Only tasks can be included."}, 400))
+    if get_stream_mode():
+        abort(make_response({"error": "include cannot be combined with streaming"}, 400))
+
+    return True
+
+def get_included_task_limit():
+    limit = request.args.get("tasks_limit", DEFAULT_INCLUDED_TASKS)
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        abort(make_response({"error": f"{limit} is an invalid tasks_limit. tasks_limit must be an integer."}, 400))
+
+    if limit < 0:
+        abort(make_response({"error": f"{limit} is an invalid tasks_limit. tasks_limit must be at least 0."}, 400))
+
+    return min(limit, MAX_INCLUDED_TASKS)
+
+def query_included_tasks(goal_ids, limit):
+    # load the tasks of every goal with one IN query; the window function caps
+    # each goal at limit + 1 rows, the extra row only flags truncation
+    row_number = func.row_number().over(
+        partition_by=Task.goal_id, order_by=Task.task_id).label("row_number")
+    ranked = db.session.query(
+        Task.task_id, Task.goal_id, Task.title, Task.description, Task.completed_at, row_number
+        ).filter(Task.goal_id.in_(goal_ids)).subquery()
+
+    rows = db.session.query(ranked).filter(ranked.c.row_number <= limit + 1).order_by(
+        ranked.c.goal_id, ranked.c.task_id)
+
+    tasks = {goal_id: [] for goal_id in goal_ids}
+    for row in rows:
+        tasks[row.goal_id].append(row)
+
+    return tasks
+
+def add_included_tasks(goal_bodies, limit):
+    if not goal_bodies:
+        return
+
+    tasks = query_included_tasks([goal_body["id"] for goal_body in goal_bodies], limit)
+
+    for goal_body in goal_bodies:
+        goal_tasks = tasks[goal_body["id"]]
+        goal_body["tasks"] = [serialize_task_with_goal(task) for task in goal_tasks[:limit]]
+        goal_body["tasks_truncated"] = len(goal_tasks) > limit
 
 def create_goal_response_body(goal):
-    response_body = {
-        "goal": {
-            "id": goal.goal_id,
-            "title": goal.title
-        }
-    }
-    return response_body
+    return {"goal": serialize_goal(goal)}
 
 @task_bp.route("", methods=["GET"])
+@query_budget(3)
 def read_all_tasks():
+    etag = check_etag("task")
     sort_query = request.args.get("sort")
+    stream_mode = get_stream_mode()
+    tasks = query_task_summaries().filter(*get_task_filters())
 
-    if sort_query == "desc":
-        tasks = Task.query.order_by(desc(Task.title))
-    elif sort_query == "asc":
-        tasks = Task.query.order_by(Task.title)
+    if sort_query in ("asc", "desc"):
+        columns = [Task.title, Task.task_id]
     else:
-        tasks = Task.query.all()
+        sort_query = None
+        columns = [Task.task_id]
+
+    if stream_mode:
+        order = [order_column(column, sort_query == "desc") for column in columns]
+        return stream_response(stream_mode, tasks.order_by(*order), serialize_task,
+            headers=create_etag_headers(etag))
+
+    tasks, next_cursor = paginate(tasks, columns, sort_query)
 
     response = []
 
     for task in tasks:
-        response.append({
-            "id": task.task_id,
-            "title": task.title,
-            "description": task.description,
-            "is_complete": False
-        })
+        response.append(serialize_task(task))
+
+    headers = create_pagination_headers(next_cursor)
+    headers.update(create_etag_headers(etag))
     
-    return jsonify(response)
+    return json_response(response), 200, headers
+
+@task_bp.route("/search", methods=["GET"])
+@query_budget(2)
+def search_all_tasks():
+    etag = check_etag("task")
+    terms = request.args.get("q", "").strip()
+
+    if not terms:
+        return json_response({"error": "q is required"}), 400
+
+    # best matches first; the filters of GET /tasks narrow the matches
+    tasks, columns = search_tasks(terms, *get_task_filters())
+    tasks, next_cursor = paginate(tasks, columns, "rank")
+
+    response_body = [serialize_task(task) for task in tasks]
+
+    headers = create_pagination_headers(next_cursor)
+    headers.update(create_etag_headers(etag))
+
+    return json_response(response_body), 200, headers
 
 @task_bp.route("/<task_id>", methods=["GET"])
+@query_budget(2)
 def read_task(task_id):
+    etag = check_etag("task")
     task_id = validate_id(task_id)
     task = retrieve_object(task_id, Task)
     
     response_body = create_task_response_body(task)
 
-    return jsonify(response_body)
+    return json_response(response_body), 200, create_etag_headers(etag)
 
 @task_bp.route("", methods=["POST"])
+@query_budget(4)
 def create_task():
-    request_body = request.get_json()
+    request_body = get_json_body()
 
     # create task with required attributes
     try:
@@ -108,7 +648,7 @@ def create_task():
             description=request_body["description"]
             )
     except KeyError:
-        return jsonify({"details": f"Invalid data"}), 400
+        return json_response({"details": f"Invalid data"}), 400
 
     # add optional attributes to task if data is provided
     try:
@@ -117,219 +657,317 @@ def create_task():
         pass
     
     db.session.add(task)
+    bump_versions("task")
     db.session.commit()
 
     response_body = create_task_response_body(task)
 
-    return jsonify(response_body), 201
+    return json_response(response_body), 201
+
+@task_bp.route("/bulk", methods=["POST"])
+@query_budget(3 + MAX_BULK_TASKS // BULK_INSERT_CHUNK_SIZE)
+def create_tasks_in_bulk():
+    request_body = read_bulk_request_body()
+
+    if len(request_body) > MAX_BULK_TASKS:
+        return json_response({"details": f"Expected at most {MAX_BULK_TASKS} tasks"}), 400
+
+    # validate every task before inserting any of them
+    rows = []
+    errors = []
+
+    for index, task_data in enumerate(request_body):
+        row, error = validate_task_row(task_data)
+        if error:
+            errors.append({"index": index, "error": error})
+        rows.append(row)
 
+    if errors:
+        return json_response({"details": "Invalid data", "errors": errors}), 400
+
+    task_ids = insert_tasks(rows)
+    bump_versions("task")
+    db.session.commit()
+
+    return json_response({"task_ids": task_ids}), 201
 
 @task_bp.route("/<task_id>", methods=["PUT"])
+@query_budget(4)
 def replace_task(task_id):
     task_id = validate_id(task_id)
-    task = retrieve_object(task_id, Task)
-    
-    request_body = request.get_json()
+    request_body = get_json_body()
 
     # replace task with required attributes
     try:
-        task.title = request_body["title"]
-        task.description = request_body["description"]
+        values = {
+            "title": request_body["title"],
+            "description": request_body["description"]
+        }
     except KeyError:
-        return jsonify({"details": f"Invalid data"}), 400
+        return json_response({"details": f"Invalid data"}), 400
 
     # replace optional attributes if data is provided
-    try:
-        task.completed_at = request_body["completed_at"]
-    except KeyError:
-        pass
+    if "completed_at" in request_body:
+        values["completed_at"] = request_body["completed_at"]
 
+    task = update_object(task_id, Task, values)
+    bump_versions("task")
     db.session.commit()
 
     response_body = create_task_response_body(task)
 
-    return jsonify(response_body), 200
+    return json_response(response_body), 200
+
+@task_bp.route("", methods=["DELETE"])
+@query_budget(3)
+def delete_tasks_in_bulk():
+    tasks = build_bulk_task_query(get_json_body(silent=True))
+
+    # one set-based DELETE in one transaction, whatever the number of tasks
+    count = tasks.delete(synchronize_session=False)
+    bump_versions("task")
+    db.session.commit()
+
+    response_body = {"details": f"{count} tasks successfully deleted", "count": count}
+
+    return json_response(response_body), 200
 
 @task_bp.route("/<task_id>", methods=["DELETE"])
+@query_budget(4)
 def delete_task(task_id):
     task_id = validate_id(task_id)
-    task = retrieve_object(task_id, Task)
-    
-    title = task.title
+    title = delete_object(task_id, Task)
 
-    db.session.delete(task)
+    bump_versions("task")
     db.session.commit()
 
     response_body = {'details': f'Task {task_id} "{title}" successfully deleted'}
 
-    return jsonify(response_body), 200
+    return json_response(response_body), 200
 
 @task_bp.route("/<task_id>/mark_complete", methods=["PATCH"])
+@query_budget(5)
 def mark_complete(task_id):
     task_id = validate_id(task_id)
-    task = retrieve_object(task_id, Task)
-    
-    # change completed at time and commit to database
-    task.completed_at = datetime.datetime.now()
-    db.session.commit()
 
-    # send automatic slack message
-    try:
-        message = "Someone just completed the task " + task.title
-        message_info = {"channel": "task-notifications", "text": message}
-        api_key = "Bearer " + os.environ.get("SLACK_BOT_USER_OAUTH_TOKEN", "")
-        headers = {"Authorization": api_key}
+    # change completed at time and queue the slack message in the same commit;
+    # the outbox dispatcher sends it outside of the request
+    task = update_object(task_id, Task, {"completed_at": datetime.datetime.now()})
 
-        r = requests.post("https://slack.com/api/chat.postMessage", params=message_info, headers=headers)
-    except:
-        return jsonify({"error": "slack message could not be sent"})
+    message = "Someone just completed the task " + task.title
+    db.session.add(OutboxMessage(channel="task-notifications", text=message))
+    bump_versions("task")
+    db.session.commit()
 
     # HTTP response body
     response_body = create_task_response_body(task)
     
-    return jsonify(response_body), 200
+    return json_response(response_body), 200
 
 @task_bp.route("/<task_id>/mark_incomplete", methods=["PATCH"])
+@query_budget(4)
 def mark_incomplete(task_id):
     task_id = validate_id(task_id)
-    task = retrieve_object(task_id, Task)
-    
+
     # change completed at time to None and commit to database
-    task.completed_at = None
+    task = update_object(task_id, Task, {"completed_at": None})
+    bump_versions("task")
     db.session.commit()
 
     response_body = create_task_response_body(task)
     
-    return jsonify(response_body), 200
+    return json_response(response_body), 200
+
+@task_bp.route("/mark_complete", methods=["PATCH"])
+@query_budget(6)
+def mark_tasks_complete():
+    tasks = build_bulk_task_query(get_json_body(silent=True))
+
+    # one UPDATE with one server-side timestamp for every task, and one
+    # slack message for all of them instead of one per task
+    tasks = update_tasks(tasks, {"completed_at": func.now()})
+
+    if tasks:
+        db.session.add(OutboxMessage(channel="task-notifications", text=create_completion_message(tasks)))
+    bump_versions("task")
+    db.session.commit()
+
+    response_body = {"tasks": [serialize_task_detail(task) for task in tasks], "count": len(tasks)}
+
+    return json_response(response_body), 200
+
+@task_bp.route("/mark_incomplete", methods=["PATCH"])
+@query_budget(5)
+def mark_tasks_incomplete():
+    tasks = build_bulk_task_query(get_json_body(silent=True))
+
+    tasks = update_tasks(tasks, {"completed_at": None})
+    bump_versions("task")
+    db.session.commit()
+
+    response_body = {"tasks": [serialize_task_detail(task) for task in tasks], "count": len(tasks)}
+
+    return json_response(response_body), 200
+
+def create_completion_message(tasks):
+    if len(tasks) == 1:
+        return "Someone just completed the task " + tasks[0].title
+
+    titles = [task.title for task in tasks[:MAX_NOTIFIED_TITLES]]
+    if len(tasks) > MAX_NOTIFIED_TITLES:
+        titles.append(f"and {len(tasks) - MAX_NOTIFIED_TITLES} more")
+
+    return f"Someone just completed {len(tasks)} tasks: " + ", ".join(titles)
 
 @goal_bp.route("", methods=["POST"])
+@query_budget(4)
 def create_goal():
-    request_body = request.get_json()
+    request_body = get_json_body()
     
     try:
         goal = Goal(title=request_body["title"])
     except KeyError:
-        return jsonify({"details": "Invalid data"}), 400
+        return json_response({"details": "Invalid data"}), 400
 
     db.session.add(goal)
+    bump_versions("goal")
     db.session.commit()
 
     response_body = create_goal_response_body(goal)
 
-    return jsonify(response_body), 201
+    return json_response(response_body), 201
 
 @goal_bp.route("", methods=["GET"])
+@query_budget(3)
 def read_all_goals():
+    include_tasks = includes_tasks()
+    etag = check_etag("goal", "task") if include_tasks else check_etag("goal")
+    stream_mode = get_stream_mode()
 
-    goals = Goal.query.all()
+    if stream_mode:
+        return stream_response(stream_mode, query_goal_summaries().order_by(Goal.goal_id), serialize_goal,
+            headers=create_etag_headers(etag))
+
+    goals, next_cursor = paginate(query_goal_summaries(), [Goal.goal_id])
     response_body = []
 
     for goal in goals:
-        response_body.append({
-            "id": goal.goal_id,
-            "title": goal.title
-        })
+        response_body.append(serialize_goal(goal))
+
+    if include_tasks:
+        add_included_tasks(response_body, get_included_task_limit())
+
+    headers = create_pagination_headers(next_cursor)
+    headers.update(create_etag_headers(etag))
 
-    return jsonify(response_body), 200
+    return json_response(response_body), 200, headers
 
 @goal_bp.route("/<goal_id>", methods=["GET"])
+@query_budget(3)
 def read_specific_goal(goal_id):
+    include_tasks = includes_tasks()
+    etag = check_etag("goal", "task") if include_tasks else check_etag("goal")
     goal_id = validate_id(goal_id)
     goal = retrieve_object(goal_id, Goal)
     
     response_body = create_goal_response_body(goal)
 
-    return jsonify(response_body), 200
+    if include_tasks:
+        add_included_tasks([response_body["goal"]], get_included_task_limit())
+
+    return json_response(response_body), 200, create_etag_headers(etag)
 
 @goal_bp.route("/<goal_id>", methods=["PUT"])
+@query_budget(4)
 def replace_goal(goal_id):
     goal_id = validate_id(goal_id)
-    goal = retrieve_object(goal_id, Goal)
-
-    request_body = request.get_json()
+    request_body = get_json_body()
 
     try:
-        goal.title = request_body["title"]
+        values = {"title": request_body["title"]}
     except KeyError:
-        return jsonify({"details": f"Invalid data"}), 400
+        return json_response({"details": f"Invalid data"}), 400
 
+    goal = update_object(goal_id, Goal, values)
+    bump_versions("goal")
     db.session.commit()
 
     response_body = create_goal_response_body(goal)
 
-    return jsonify(response_body), 200
+    return json_response(response_body), 200
 
 @goal_bp.route("/<goal_id>", methods=["DELETE"])
+@query_budget(7)
 def delete_goal(goal_id):
     goal_id = validate_id(goal_id)
-    goal = retrieve_object(goal_id, Goal)
 
-    title = goal.title
-    
-    db.session.delete(goal)
+    # detach the goal's tasks first, as the ORM cascade did, then delete it
+    Task.query.filter(Task.goal_id == goal_id).update({Task.goal_id: None}, synchronize_session=False)
+    title = delete_object(goal_id, Goal)
+
+    bump_versions("goal", "task")
     db.session.commit()
     
     response_body = {"details": f'Goal {goal_id} "{title}" successfully deleted'}
 
-    return jsonify(response_body), 200
+    return json_response(response_body), 200
 
 @goal_bp.route("/<goal_id>/tasks", methods=["POST"])
+@query_budget(6)
 def send_list_of_tasks_to_goal(goal_id):
     goal_id = validate_id(goal_id)
     goal = retrieve_object(goal_id, Goal)
 
-    request_body = request.get_json()
+    request_body = get_json_body()
 
     # verify task_ids list in request body
     try:
         task_ids = request_body["task_ids"]
     except KeyError:
-        return jsonify({"details": f"Invalid data"}), 400
+        return json_response({"details": f"Invalid data"}), 400
 
     if not isinstance(task_ids, list):
-        return jsonify({"details": "Expected list of task ids"}), 400
-
-    # validate task_ids and append tasks to list of tasks
-    tasks = []
+        return json_response({"details": "Expected list of task ids"}), 400
 
-    for task_id in task_ids:
-        task_id = validate_id(task_id)
-        task = retrieve_object(task_id, Task)
-        tasks.append(task)
+    task_ids = retrieve_task_ids(task_ids)
 
-    # update goal_id for each task
-    for task in tasks:
-        task.goal_id = goal_id
+    # update goal_id for every task with one set-based statement
+    if task_ids:
+        Task.query.filter(Task.task_id.in_(task_ids)).update(
+            {Task.goal_id: goal_id}, synchronize_session=False)
     
+    bump_versions("task")
     db.session.commit()
 
     # create task_ids list using updated data
-    task_ids = []
-    for task in goal.tasks:
-        task_ids.append(task.task_id)
+    task_ids = db.session.query(Task.task_id).filter_by(goal_id=goal_id).order_by(Task.task_id)
+    task_ids = [task_id for task_id, in task_ids]
     
     response_body = {
-        "id": goal.goal_id,
+        "id": goal_id,
         "task_ids": task_ids
     }
 
-    return jsonify(response_body), 200
+    return json_response(response_body), 200
 
 @goal_bp.route("/<goal_id>/tasks", methods=["GET"])
+@query_budget(3)
 def read_tasks_of_one_goal(goal_id):
+    etag = check_etag("goal", "task")
     goal_id = validate_id(goal_id)
     goal = retrieve_object(goal_id, Goal)
+    stream_mode = get_stream_mode()
+
+    if stream_mode:
+        tasks = query_goal_task_summaries(goal_id).order_by(Task.task_id)
+        envelope = {"id": goal_id, "title": goal.title}
+        return stream_response(stream_mode, tasks, serialize_task_with_goal, envelope,
+            headers=create_etag_headers(etag))
     
     task_response = []
 
-    for task in goal.tasks:
-        task_response.append({
-            "id": task.task_id,
-            "goal_id": task.goal_id,
-            "title": task.title,
-            "description": task.description,
-            "is_complete": bool(task.completed_at)
-        })
+    for task in query_goal_task_summaries(goal_id).order_by(Task.task_id):
+        task_response.append(serialize_task_with_goal(task))
 
     response_body = {
         "id": goal_id,
@@ -337,4 +975,4 @@ def read_tasks_of_one_goal(goal_id):
         "tasks": task_response
     }
 
-    return jsonify(response_body), 200
\ No newline at end of file
+    return json_response(response_body), 200, create_etag_headers(etag)
\ No newline at end of file
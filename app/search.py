@@ -0,0 +1,46 @@
+from app import db
+from app.models.task import Task
+from sqlalchemy import cast, func
+
+# title matches rank above description matches; mirrors ts_rank's default
+# weights for the 'A' (1.0) and 'B' (0.4) labels used on PostgreSQL
+TITLE_WEIGHT = 2.5
+DESCRIPTION_WEIGHT = 1.0
+
+
+def build_fts5_query(terms):
+    # quote every word so user input is matched literally instead of being
+    # parsed as FTS5 query syntax; the words are implicitly ANDed
+    return " ".join('"' + word.replace('"', '""') + '"' for word in terms.split())
+
+
+def query_search_matches(terms):
+    # rows of (task_id, rank) for the tasks matching terms; a lower rank is a
+    # better match on every dialect so results are ordered by rank, task_id
+    if db.session.get_bind().dialect.name == "postgresql":
+        search_vector = db.literal_column("task.search_vector")
+        ts_query = func.websearch_to_tsquery("english", terms)
+        # ts_rank returns real; as double precision, the rank in a cursor
+        # round-trips through JSON and compares equal to the row's rank
+        rank = cast(-func.ts_rank(search_vector, ts_query), db.Float(precision=53))
+        return db.session.query(Task.task_id, rank.label("rank")).filter(search_vector.op("@@")(ts_query))
+
+    task_search = db.table("task_search", db.column("rowid"))
+    rank = func.bm25(db.literal_column("task_search"), TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+    return (db.session.query(task_search.c.rowid.label("task_id"), rank.label("rank"))
+        .select_from(task_search)
+        .filter(db.literal_column("task_search").op("MATCH")(build_fts5_query(terms))))
+
+
+def search_tasks(terms, *clauses):
+    # the ranked matches become a subquery so the rank can be used as a
+    # keyset pagination column like any other
+    matches = query_search_matches(terms).subquery()
+
+    results = (db.session.query(
+        Task.task_id, Task.title, Task.description, Task.completed_at, matches.c.rank)
+        .join(matches, matches.c.task_id == Task.task_id)
+        .filter(*clauses)
+        .subquery())
+
+    return db.session.query(results), [results.c.rank, results.c.task_id]
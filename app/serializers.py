@@ -0,0 +1,108 @@
+from flask import Response, abort, current_app, make_response, request
+from operator import attrgetter
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def compile_plan(*fields):
+    # a plan is built once per shape: one attrgetter fetches every attribute
+    # of a row in a single call, and only the fields that need it are converted
+    keys = tuple(key for key, _, _ in fields)
+    getter = attrgetter(*(attribute for _, attribute, _ in fields))
+    conversions = tuple(
+        (index, convert) for index, (_, _, convert) in enumerate(fields) if convert is not None)
+
+    if not conversions:
+        return lambda row: dict(zip(keys, getter(row)))
+
+    def serialize(row):
+        values = list(getter(row))
+        for index, convert in conversions:
+            values[index] = convert(values[index])
+        return dict(zip(keys, values))
+
+    return serialize
+
+
+serialize_task = compile_plan(
+    ("id", "task_id", None),
+    ("title", "title", None),
+    ("description", "description", None),
+    ("is_complete", "completed_at", bool))
+
+serialize_task_with_goal = compile_plan(
+    ("id", "task_id", None),
+    ("goal_id", "goal_id", None),
+    ("title", "title", None),
+    ("description", "description", None),
+    ("is_complete", "completed_at", bool))
+
+serialize_goal = compile_plan(
+    ("id", "goal_id", None),
+    ("title", "title", None))
+
+
+def serialize_task_detail(task):
+    if task.goal_id:
+        return serialize_task_with_goal(task)
+    return serialize_task(task)
+
+
+class StdlibJSON:
+    name = "stdlib"
+
+    def dumps(self, data):
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonJSON:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+JSON_BACKENDS = {
+    "stdlib": StdlibJSON,
+    "orjson": OrjsonJSON
+}
+
+
+def init_json_backend(app):
+    name = app.config["JSON_BACKEND"]
+
+    try:
+        backend = JSON_BACKENDS[name]()
+    except (KeyError, ImportError):
+        logger.warning("JSON backend %s is not available, using the standard library", name)
+        backend = StdlibJSON()
+
+    app.extensions["json_backend"] = backend
+
+
+def get_json_backend():
+    return current_app.extensions["json_backend"]
+
+
+def json_response(data, status=200, headers=None):
+    return Response(get_json_backend().dumps(data), status=status, headers=headers,
+        mimetype="application/json")
+
+
+def get_json_body(silent=False):
+    if not request.is_json:
+        return None
+
+    try:
+        return get_json_backend().loads(request.get_data())
+    except ValueError:
+        if silent:
+            return None
+        abort(make_response({"details": "Invalid data"}, 400))
@@ -0,0 +1,59 @@
+from app import create_app, db
+from app.models.task import Task
+from app.models.goal import Goal
+import datetime
+import os
+import time
+
+SEED_CHUNK_SIZE = 5000
+
+
+def create_benchmark_app(database_uri=None):
+    # benchmarks run against BENCHMARK_DATABASE_URI, a throwaway sqlite file by default
+    database_uri = database_uri or os.environ.get(
+        "BENCHMARK_DATABASE_URI", "sqlite:////tmp/task_list_benchmark.db")
+
+    return create_app({"TESTING": False, "SQLALCHEMY_DATABASE_URI": database_uri})
+
+
+def reset_database():
+    db.drop_all()
+    db.create_all()
+
+
+def seed(tasks, goals=0, completed_ratio=0.5):
+    # insert rows in executemany chunks so seeding 1M tasks stays practical
+    goal_rows = [{"title": f"Goal {i}"} for i in range(goals)]
+    if goal_rows:
+        db.session.execute(Goal.__table__.insert(), goal_rows)
+
+    completed_every = int(1 / completed_ratio) if completed_ratio else 0
+    now = datetime.datetime.utcnow()
+
+    for start in range(0, tasks, SEED_CHUNK_SIZE):
+        rows = []
+        for i in range(start, min(start + SEED_CHUNK_SIZE, tasks)):
+            rows.append({
+                "title": f"Task {i * 7919 % tasks:08d}",
+                "description": f"Description of task {i}",
+                "completed_at": now if completed_every and i % completed_every == 0 else None,
+                "goal_id": i % goals + 1 if goals else None
+            })
+        db.session.execute(Task.__table__.insert(), rows)
+
+    db.session.commit()
+
+
+def percentile(samples, percent):
+    samples = sorted(samples)
+    if not samples:
+        return None
+
+    index = min(len(samples) - 1, max(0, int(round(percent / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
@@ -0,0 +1,175 @@
+"""Measure latency percentiles and throughput of every task and goal route on seeded datasets.
+
+    python -m benchmarks.endpoints --sizes 1000 100000 1000000 --output results.json
+
+Each route is called through the Flask test client against the database in
+BENCHMARK_DATABASE_URI. Routes that delete rows create their own targets in an
+untimed setup step, so every route sees a dataset of the seeded size.
+"""
+from benchmarks.common import create_benchmark_app, percentile, reset_database, seed, timed
+from app import db
+import argparse
+import datetime
+import json
+import subprocess
+import sys
+
+BULK_DELETE_SIZE = 10
+
+
+def create_task(client):
+    response = client.post("/tasks", json={"title": "Benchmark task", "description": "Created for a delete"})
+    return response.get_json()["task"]["id"]
+
+
+def create_goal(client):
+    response = client.post("/goals", json={"title": "Benchmark goal"})
+    return response.get_json()["goal"]["id"]
+
+
+def build_scenarios(tasks, goals):
+    # endpoint -> function(client, i) returning the arguments of the i-th timed request
+    task_id = lambda i: i * 7919 % tasks + 1
+    goal_id = lambda i: i % goals + 1
+
+    return {
+        "task.read_all_tasks": lambda client, i: {"path": "/tasks"},
+        "task.search_all_tasks": lambda client, i: {"path": "/tasks/search", "query_string": {"q": f"task {i}"}},
+        "task.read_task": lambda client, i: {"path": f"/tasks/{task_id(i)}"},
+        "task.create_task": lambda client, i: {"path": "/tasks",
+            "json": {"title": f"New task {i}", "description": "Created by the benchmark"}},
+        "task.create_tasks_in_bulk": lambda client, i: {"path": "/tasks/bulk",
+            "json": [{"title": f"Bulk task {i}.{j}", "description": ""} for j in range(100)]},
+        "task.replace_task": lambda client, i: {"path": f"/tasks/{task_id(i)}",
+            "json": {"title": f"Task {task_id(i):08d}", "description": "Replaced by the benchmark"}},
+        "task.delete_tasks_in_bulk": lambda client, i: {"path": "/tasks",
+            "json": {"task_ids": [create_task(client) for _ in range(BULK_DELETE_SIZE)]}},
+        "task.delete_task": lambda client, i: {"path": f"/tasks/{create_task(client)}"},
+        "task.mark_complete": lambda client, i: {"path": f"/tasks/{task_id(i)}/mark_complete"},
+        "task.mark_incomplete": lambda client, i: {"path": f"/tasks/{task_id(i)}/mark_incomplete"},
+        "task.mark_tasks_complete": lambda client, i: {"path": "/tasks/mark_complete",
+            "json": {"filter": {"goal_id": goal_id(i)}}},
+        "task.mark_tasks_incomplete": lambda client, i: {"path": "/tasks/mark_incomplete",
+            "json": {"filter": {"goal_id": goal_id(i)}}},
+        "goal.create_goal": lambda client, i: {"path": "/goals", "json": {"title": f"New goal {i}"}},
+        "goal.read_all_goals": lambda client, i: {"path": "/goals"},
+        "goal.read_specific_goal": lambda client, i: {"path": f"/goals/{goal_id(i)}"},
+        "goal.replace_goal": lambda client, i: {"path": f"/goals/{goal_id(i)}", "json": {"title": f"Goal {i}"}},
+        "goal.delete_goal": lambda client, i: {"path": f"/goals/{create_goal(client)}"},
+        "goal.send_list_of_tasks_to_goal": lambda client, i: {"path": f"/goals/{goal_id(i)}/tasks",
+            "json": {"task_ids": [task_id(i)]}},
+        "goal.read_tasks_of_one_goal": lambda client, i: {"path": f"/goals/{goal_id(i)}/tasks"}
+    }
+
+
+def list_routes(app):
+    # every (endpoint, method, rule) of the task and goal blueprints
+    routes = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint.split(".")[0] not in ("task", "goal"):
+            continue
+        for method in sorted(rule.methods - {"HEAD", "OPTIONS"}):
+            routes.append((rule.endpoint, method, rule.rule))
+
+    return sorted(routes)
+
+
+def measure(client, method, make_request, requests, warmup):
+    for i in range(warmup):
+        client.open(method=method, **make_request(client, i))
+
+    latencies = []
+    errors = 0
+
+    for i in range(warmup, warmup + requests):
+        kwargs = make_request(client, i)
+        elapsed, response = timed(client.open, method=method, **kwargs)
+        latencies.append(elapsed)
+        if response.status_code >= 400:
+            errors += 1
+
+    return latencies, errors
+
+
+def summarize(latencies, errors):
+    to_ms = lambda seconds: round(seconds * 1000, 3)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": to_ms(percentile(latencies, 50)),
+        "p95_ms": to_ms(percentile(latencies, 95)),
+        "p99_ms": to_ms(percentile(latencies, 99)),
+        "mean_ms": to_ms(sum(latencies) / len(latencies)),
+        "max_ms": to_ms(max(latencies)),
+        "throughput_rps": round(len(latencies) / sum(latencies), 1)
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--goals", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--routes", nargs="+", help="only these endpoints, e.g. task.read_all_tasks")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    client = app.test_client()
+    routes = list_routes(app)
+
+    scenarios = build_scenarios(1, 1)
+    missing = [endpoint for endpoint, _, _ in routes if endpoint not in scenarios]
+    if missing:
+        parser.error(f"no benchmark scenario for {', '.join(missing)}")
+
+    if args.routes:
+        routes = [route for route in routes if route[0] in args.routes]
+
+    results = {
+        "commit": current_commit(),
+        "database": app.config["SQLALCHEMY_DATABASE_URI"].split(":")[0],
+        "created_at": datetime.datetime.utcnow().isoformat() + "Z",
+        "requests_per_route": args.requests,
+        "results": []
+    }
+
+    for size in args.sizes:
+        with app.app_context():
+            reset_database()
+            elapsed, _ = timed(seed, size, args.goals)
+            db.session.execute("ANALYZE")
+            db.session.commit()
+        print(f"seeded {size} tasks in {elapsed:.1f} s", file=sys.stderr)
+
+        scenarios = build_scenarios(size, args.goals)
+
+        for endpoint, method, rule in routes:
+            latencies, errors = measure(client, method, scenarios[endpoint], args.requests, args.warmup)
+            summary = summarize(latencies, errors)
+            results["results"].append({"tasks": size, "goals": args.goals, "endpoint": endpoint,
+                "method": method, "route": rule, **summary})
+            print(f"{size:>8} {method:>6} {rule:<36} p50 {summary['p50_ms']:>9.2f} ms  "
+                f"p95 {summary['p95_ms']:>9.2f} ms  p99 {summary['p99_ms']:>9.2f} ms  "
+                f"{summary['throughput_rps']:>8.1f} req/s", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Measure encode and decode throughput of the JSON backends on large task lists.
+
+    python -m benchmarks.json_codecs --sizes 10000 100000
+"""
+from benchmarks.common import create_benchmark_app, timed
+from app.serializers import JSON_BACKENDS, serialize_task
+from flask import json as flask_json, jsonify
+from types import SimpleNamespace
+import argparse
+import datetime
+
+
+def build_tasks(size):
+    now = datetime.datetime.utcnow()
+    rows = [
+        SimpleNamespace(task_id=i, title=f"Task {i} 🌷", description=f"Description of task {i}",
+            completed_at=now if i % 2 else None)
+        for i in range(size)
+    ]
+    return [serialize_task(row) for row in rows]
+
+
+def report(name, size, encode_seconds, decode_seconds, body_size):
+    print(f"{name:>8} {size:>8} tasks  "
+        f"encode {size / encode_seconds:>10.0f} tasks/s {body_size / encode_seconds / 1e6:>7.1f} MB/s  "
+        f"decode {size / decode_seconds:>10.0f} tasks/s {body_size / decode_seconds / 1e6:>7.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+
+    for size in args.sizes:
+        tasks = build_tasks(size)
+
+        for name, Backend in JSON_BACKENDS.items():
+            try:
+                backend = Backend()
+            except ImportError:
+                print(f"{name:>8} not installed")
+                continue
+
+            body = backend.dumps(tasks)
+            encode_seconds = min(timed(backend.dumps, tasks)[0] for _ in range(args.repeat))
+            decode_seconds = min(timed(backend.loads, body)[0] for _ in range(args.repeat))
+            report(name, size, encode_seconds, decode_seconds, len(body))
+
+        # Flask's jsonify and get_json decoder, which the routes used before
+        with app.test_request_context():
+            body = jsonify(tasks).get_data()
+            encode_seconds = min(timed(jsonify, tasks)[0] for _ in range(args.repeat))
+            decode_seconds = min(timed(flask_json.loads, body)[0] for _ in range(args.repeat))
+        report("jsonify", size, encode_seconds, decode_seconds, len(body))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Show query plans for the task list queries with and without the task indexes.
+
+    python -m benchmarks.query_plans --tasks 100000 --goals 100
+"""
+from benchmarks.common import create_benchmark_app, reset_database, seed, timed
+from app import db
+from app.models.task import Task
+from app.routes import build_keyset_clause, build_title_prefix_clause
+from sqlalchemy import desc
+import argparse
+import datetime
+import sys
+
+TASK_INDEXES = ["ix_task_goal_id", "ix_task_title_task_id", "ix_task_incomplete",
+    "ix_task_completed_at", "ix_task_title_pattern"]
+
+
+def benchmark_queries():
+    return {
+        "tasks of one goal": Task.query.filter_by(goal_id=1).order_by(Task.task_id),
+        "tasks sorted asc": Task.query.order_by(Task.title, Task.task_id).limit(100),
+        "tasks sorted desc": Task.query.order_by(desc(Task.title), desc(Task.task_id)).limit(100),
+        "incomplete tasks": Task.query.filter(Task.completed_at.is_(None)).order_by(Task.task_id).limit(100),
+        "completed in the last day": Task.query.filter(
+            Task.completed_at > datetime.datetime.utcnow() - datetime.timedelta(days=1)
+            ).order_by(Task.task_id).limit(100),
+        "title prefix": Task.query.filter(build_title_prefix_clause("Task 000012")).order_by(Task.task_id),
+        **keyset_page_queries("Task 00000000", 0),
+        **keyset_page_queries("Task 00090000", 90000)
+    }
+
+
+def keyset_page_queries(title, task_id):
+    # the sorted page after the cursor (title, task_id), as paginate builds it
+    columns = [Task.title, Task.task_id]
+    return {
+        f"sorted asc page after {title}": Task.query.filter(
+            build_keyset_clause(columns, [title, task_id], False)).order_by(*columns).limit(101),
+        f"sorted desc page before {title}": Task.query.filter(
+            build_keyset_clause(columns, [title, task_id], True)).order_by(*[desc(c) for c in columns]).limit(101)
+    }
+
+
+def check_keyset_plans():
+    # a keyset page must start with an index range scan: the cost of a page
+    # may not grow with its depth
+    failed = []
+    for name, query in keyset_page_queries("Task 00090000", 90000).items():
+        plan = "\n".join(explain(query))
+        if db.engine.dialect.name == "sqlite":
+            uses_range = "SEARCH" in plan and "ix_task_title_task_id" in plan
+        else:
+            uses_range = "Index Cond" in plan
+        if not uses_range:
+            failed.append(name)
+            print(f"\n{name} does not seek the (title, task_id) index:\n{plan}", file=sys.stderr)
+
+    return not failed
+
+
+def explain(query):
+    dialect = db.engine.dialect
+    statement = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+    if dialect.name == "sqlite":
+        rows = db.session.execute("EXPLAIN QUERY PLAN " + statement)
+        return [row[-1] for row in rows]
+
+    rows = db.session.execute("EXPLAIN ANALYZE " + statement)
+    return [row[0] for row in rows]
+
+
+def report(label, repeat):
+    print(f"\n===== {label} =====")
+
+    for name, query in benchmark_queries().items():
+        elapsed = min(timed(query.all)[0] for _ in range(repeat))
+        print(f"\n-- {name}: best of {repeat} {elapsed * 1000:.2f} ms")
+        for line in explain(query):
+            print("   ", line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--goals", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        reset_database()
+        seed(args.tasks, args.goals)
+
+        for name in TASK_INDEXES:
+            db.session.execute(f"DROP INDEX IF EXISTS {name}")
+        db.session.commit()
+        db.session.execute("ANALYZE")
+        report("before: no task indexes", args.repeat)
+
+        for index in Task.__table__.indexes:
+            index.create(db.engine)
+        if db.engine.dialect.name == "postgresql":
+            db.session.execute("CREATE INDEX ix_task_title_pattern ON task (title text_pattern_ops)")
+            db.session.commit()
+        db.session.execute("ANALYZE")
+        report("after: task indexes", args.repeat)
+
+        if not check_keyset_plans():
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
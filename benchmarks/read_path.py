@@ -0,0 +1,47 @@
+"""Compare rows/second of the ORM and column-projected read paths for task lists.
+
+    python -m benchmarks.read_path --sizes 10000 100000
+"""
+from benchmarks.common import create_benchmark_app, reset_database, seed, timed
+from app import db
+from app.models.task import Task
+from app.routes import query_task_summaries
+from app.serializers import serialize_task
+import argparse
+
+
+def orm_read():
+    return [serialize_task(task) for task in Task.query.order_by(Task.task_id)]
+
+
+def column_read():
+    return [serialize_task(task) for task in query_task_summaries().order_by(Task.task_id)]
+
+
+def best_rate(read, rows, repeat):
+    best = min(timed(read)[0] for _ in range(repeat))
+    db.session.remove()
+    return rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        for size in args.sizes:
+            reset_database()
+            seed(size)
+
+            orm_rate = best_rate(orm_read, size, args.repeat)
+            column_rate = best_rate(column_read, size, args.repeat)
+
+            print(f"{size:>8} rows  orm {orm_rate:>10.0f} rows/s  "
+                f"columns {column_rate:>10.0f} rows/s  speedup {column_rate / orm_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
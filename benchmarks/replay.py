@@ -0,0 +1,227 @@
+"""Replay recorded requests against the app and report latency per route.
+
+    python -m benchmarks.replay traffic.jsonl --concurrency 8 --speedup 10
+    python -m benchmarks.replay traffic.jsonl --url http://localhost:8000 --output report.json
+
+Every line of the log is a JSON object with a method and a path, plus an
+optional body, headers and timing: either "offset" (seconds since the start
+of the recording) or "timestamp" (epoch seconds or ISO 8601). Lines without a
+method and path are skipped. Requests are sent at their recorded times
+divided by --speedup; --speedup 0 sends them as fast as the workers allow.
+
+Without --url the requests go through the Flask test client against
+BENCHMARK_DATABASE_URI, which --seed resets and fills first; otherwise they go
+to a running server such as gunicorn.
+"""
+from benchmarks.common import create_benchmark_app, percentile, reset_database, seed
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dateutil import parser as date_parser
+from werkzeug.exceptions import HTTPException
+import argparse
+import json
+import sys
+import threading
+import time
+
+
+def parse_time(entry):
+    if "offset" in entry:
+        return float(entry["offset"])
+
+    timestamp = entry.get("timestamp")
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    return date_parser.parse(timestamp).timestamp()
+
+
+def read_log(file):
+    entries = []
+    skipped = 0
+
+    for line in file:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            skipped += 1
+            continue
+
+        if not isinstance(entry, dict) or not entry.get("method") or not entry.get("path"):
+            skipped += 1
+            continue
+
+        entries.append({
+            "method": entry["method"].upper(),
+            "path": entry["path"],
+            "body": entry.get("body"),
+            "headers": entry.get("headers") or {},
+            "time": parse_time(entry)
+        })
+
+    # schedule relative to the first timed request; untimed requests go out immediately
+    times = [entry["time"] for entry in entries if entry["time"] is not None]
+    start = min(times) if times else 0
+    for entry in entries:
+        entry["offset"] = entry["time"] - start if entry["time"] is not None else 0
+
+    entries.sort(key=lambda entry: entry["offset"])
+
+    return entries, skipped
+
+
+def create_route_matcher(app):
+    adapter = app.url_map.bind("localhost")
+
+    def match(method, path):
+        try:
+            rule, _ = adapter.match(path.split("?")[0], method=method, return_rule=True)
+        except HTTPException:
+            return "unmatched"
+        return rule.rule
+
+    return match
+
+
+class InProcessTarget:
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def send(self, entry):
+        if not hasattr(self.local, "client"):
+            self.local.client = self.app.test_client()
+
+        kwargs = {"method": entry["method"], "path": entry["path"], "headers": entry["headers"]}
+        if isinstance(entry["body"], str):
+            kwargs["data"] = entry["body"]
+        elif entry["body"] is not None:
+            kwargs["json"] = entry["body"]
+
+        return self.local.client.open(**kwargs).status_code
+
+
+class HTTPTarget:
+    def __init__(self, url, timeout):
+        import requests
+
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.local = threading.local()
+        self.requests = requests
+
+    def send(self, entry):
+        if not hasattr(self.local, "session"):
+            self.local.session = self.requests.Session()
+
+        kwargs = {"headers": entry["headers"], "timeout": self.timeout}
+        if isinstance(entry["body"], str):
+            kwargs["data"] = entry["body"].encode()
+        elif entry["body"] is not None:
+            kwargs["json"] = entry["body"]
+
+        return self.local.session.request(entry["method"], self.url + entry["path"], **kwargs).status_code
+
+
+def replay(entries, target, match_route, concurrency, speedup):
+    results = defaultdict(list)
+    lock = threading.Lock()
+
+    def send(entry):
+        start = time.perf_counter()
+        try:
+            status = target.send(entry)
+        except Exception as error:
+            status = None
+            print(f"{entry['method']} {entry['path']} failed: {error!r}", file=sys.stderr)
+        elapsed = time.perf_counter() - start
+
+        route = f"{entry['method']} {match_route(entry['method'], entry['path'])}"
+        with lock:
+            results[route].append((elapsed, status))
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for entry in entries:
+            if speedup:
+                delay = entry["offset"] / speedup - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(send, entry)
+
+    return results, time.perf_counter() - started
+
+
+def summarize(samples, duration):
+    to_ms = lambda seconds: round(seconds * 1000, 3)
+    latencies = [elapsed for elapsed, _ in samples]
+    errors = sum(1 for _, status in samples if status is None or status >= 500)
+    client_errors = sum(1 for _, status in samples if status is not None and 400 <= status < 500)
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4),
+        "client_errors": client_errors,
+        "p50_ms": to_ms(percentile(latencies, 50)),
+        "p95_ms": to_ms(percentile(latencies, 95)),
+        "p99_ms": to_ms(percentile(latencies, 99)),
+        "max_ms": to_ms(max(latencies)),
+        "throughput_rps": round(len(samples) / duration, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", type=argparse.FileType("r"), help="recorded requests, one JSON object per line")
+    parser.add_argument("--url", help="replay against a running server instead of in-process")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, help="in-process only: reset the database and seed this many tasks")
+    parser.add_argument("--goals", type=int, default=100)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    entries, skipped = read_log(args.log)
+    if skipped:
+        print(f"skipped {skipped} lines without a method and path", file=sys.stderr)
+    if not entries:
+        parser.error("no requests to replay")
+
+    # the app is only needed in-process, but its URL map groups results by route either way
+    app = create_benchmark_app()
+    target = HTTPTarget(args.url, args.timeout) if args.url else InProcessTarget(app)
+
+    if args.seed is not None and not args.url:
+        with app.app_context():
+            reset_database()
+            seed(args.seed, args.goals)
+
+    results, duration = replay(entries, target, create_route_matcher(app), args.concurrency, args.speedup)
+
+    samples = [sample for route_samples in results.values() for sample in route_samples]
+    report = {
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "speedup": args.speedup,
+        "duration_s": round(duration, 3),
+        "skipped": skipped,
+        "total": summarize(samples, duration),
+        "routes": {route: summarize(results[route], duration) for route in sorted(results)}
+    }
+
+    for route, summary in [("total", report["total"])] + list(report["routes"].items()):
+        print(f"{route:<44} {summary['requests']:>7} req  {summary['throughput_rps']:>8.1f} req/s  "
+            f"errors {summary['error_rate']:>6.1%}  p50 {summary['p50_ms']:>9.2f} ms  "
+            f"p95 {summary['p95_ms']:>9.2f} ms  p99 {summary['p99_ms']:>9.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare gunicorn serving profiles under the same concurrent read load.
+
+    python -m benchmarks.serving --tasks 100000 --requests 5000 --concurrency 32
+
+Each profile starts gunicorn with gunicorn.conf.py and its environment
+overrides against BENCHMARK_DATABASE_URI, replays the same request mix as fast
+as --concurrency clients allow, and reports throughput and latency percentiles.
+"""
+from benchmarks.common import create_benchmark_app, reset_database, seed
+from benchmarks.replay import HTTPTarget, create_route_matcher, replay, summarize
+from app import db
+import argparse
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+PROFILES = {
+    "sync": {"GUNICORN_WORKER_CLASS": "sync"},
+    "sync-no-preload": {"GUNICORN_WORKER_CLASS": "sync", "GUNICORN_PRELOAD": "0"},
+    "gthread": {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_THREADS": "4"},
+    "gevent": {"GUNICORN_WORKER_CLASS": "gevent"}
+}
+
+
+def build_requests(count, tasks, goals):
+    paths = [
+        lambda i: "/tasks?limit=100",
+        lambda i: f"/tasks/{i * 7919 % tasks + 1}",
+        lambda i: f"/goals/{i % goals + 1}",
+        lambda i: f"/tasks/search?q=task+{i % tasks}"
+    ]
+    return [{"method": "GET", "path": paths[i % len(paths)](i), "body": None, "headers": {}, "offset": 0}
+        for i in range(count)]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(profile, port, database_uri):
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=database_uri, GUNICORN_BIND=f"127.0.0.1:{port}",
+        **PROFILES[profile])
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:create_app()"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with {server.returncode} for profile {profile}")
+            time.sleep(0.2)
+
+    server.terminate()
+    raise RuntimeError(f"gunicorn did not start for profile {profile}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=["sync", "sync-no-preload", "gthread"],
+        choices=sorted(PROFILES))
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--goals", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    if "gevent" in args.profiles and importlib.util.find_spec("gevent") is None:
+        parser.error("the gevent profile needs the gevent package")
+
+    app = create_benchmark_app()
+    database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    with app.app_context():
+        reset_database()
+        seed(args.tasks, args.goals)
+        db.engine.dispose()
+
+    entries = build_requests(args.requests, args.tasks, args.goals)
+    match_route = create_route_matcher(app)
+    results = {"tasks": args.tasks, "requests": args.requests, "concurrency": args.concurrency, "profiles": {}}
+
+    for profile in args.profiles:
+        port = free_port()
+        server = start_server(profile, port, database_uri)
+        try:
+            target = HTTPTarget(f"http://127.0.0.1:{port}", timeout=30)
+            replay(entries[:args.concurrency * 4], target, match_route, args.concurrency, 0)
+            samples, duration = replay(entries, target, match_route, args.concurrency, 0)
+        finally:
+            server.terminate()
+            server.wait()
+
+        samples = [sample for route_samples in samples.values() for sample in route_samples]
+        summary = summarize(samples, duration)
+        results["profiles"][profile] = summary
+        print(f"{profile:<16} {summary['throughput_rps']:>8.1f} req/s  errors {summary['error_rate']:>6.1%}  "
+            f"p50 {summary['p50_ms']:>8.2f} ms  p95 {summary['p95_ms']:>8.2f} ms  "
+            f"p99 {summary['p99_ms']:>8.2f} ms", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Measure cold start of create_app() and report the slowest imports.
+
+    python -m benchmarks.startup --runs 10 --max-ms 400
+
+Every run is a fresh interpreter started with -X importtime, configured the
+way gunicorn.conf.py serves the app. The run fails when the median start
+exceeds --max-ms or when a module listed in --forbid is imported, so import
+regressions are caught before they slow down scaling.
+"""
+from collections import defaultdict
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+STARTUP_SCRIPT = """
+import time
+started_at = time.perf_counter()
+from app import create_app
+create_app()
+print(time.perf_counter() - started_at)
+"""
+
+# only the routes or commands that need these import them
+DEFERRED_MODULES = ["requests", "dateutil", "alembic", "flask_migrate", "orjson"]
+
+
+def run_once(env):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        env=env, capture_output=True, text=True, check=True)
+    elapsed = float(result.stdout.strip().splitlines()[-1])
+    return elapsed, parse_importtime(result.stderr)
+
+
+def parse_importtime(report):
+    # "import time: self [us] | cumulative | imported package", nested by indentation
+    imports = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        imports[name.strip()] = int(cumulative) / 1000
+
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, help="fail when the median start takes longer")
+    parser.add_argument("--forbid", nargs="*",
+        help="fail when any of these modules is imported at startup (default: the deferred modules)")
+    parser.add_argument("--with-migrations", action="store_true", help="load Flask-Migrate as `flask db` does")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    if args.forbid is None:
+        # Alembic brings dateutil along when migrations are loaded
+        skipped = ["alembic", "flask_migrate", "dateutil"] if args.with_migrations else []
+        args.forbid = [name for name in DEFERRED_MODULES if name not in skipped]
+
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=os.environ.get("SQLALCHEMY_DATABASE_URI", "sqlite://"),
+        MIGRATIONS_ENABLED="1" if args.with_migrations else "0")
+
+    timings = []
+    imports = defaultdict(list)
+    for _ in range(args.runs):
+        elapsed, run_imports = run_once(env)
+        timings.append(elapsed * 1000)
+        for name, cumulative in run_imports.items():
+            imports[name].append(cumulative)
+
+    median_ms = statistics.median(timings)
+    top_level = {name: statistics.median(values) for name, values in imports.items() if "." not in name}
+    slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    forbidden = sorted(name for name in args.forbid if name in imports)
+
+    print(f"create_app() cold start: median {median_ms:.1f} ms, min {min(timings):.1f} ms, "
+        f"max {max(timings):.1f} ms over {args.runs} runs", file=sys.stderr)
+    for name, cumulative in slowest:
+        print(f"    {cumulative:>8.1f} ms  {name}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"median_ms": median_ms, "timings_ms": timings, "slowest_imports_ms": dict(slowest),
+                "forbidden_imports": forbidden}, file, indent=2)
+            file.write("\n")
+
+    failed = False
+    if forbidden:
+        print(f"imported at startup: {', '.join(forbidden)}", file=sys.stderr)
+        failed = True
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"median start {median_ms:.1f} ms exceeds {args.max_ms:.1f} ms", file=sys.stderr)
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
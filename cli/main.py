@@ -33,7 +33,7 @@ def get_task_from_user(msg = "Input the id of the task you would like to work wi
     task = None
     tasks = task_list.list_tasks()
     if not tasks:
-        task_list.print_stars("This option is not possible because there are no tasks.")
+        print_surround_stars("This option is not possible because there are no tasks.")
         return task
     count = 0
     help_count = 3 #number of tries before offering assistance
@@ -118,9 +118,8 @@ def change_task_complete_status(status):
         print_task(response)
 
 def delete_all_tasks():
-    for task in task_list.list_tasks():
-        task_list.delete_task(task["id"])
-        print_surround_stars("Deleted all tasks.")
+    task_list.delete_all_tasks()
+    print_surround_stars("Deleted all tasks.")
 
 def run_cli():
     
@@ -130,6 +129,9 @@ def run_cli():
         # get input and validate
         choice = make_choice()
 
+        # start every interaction with a fresh task list
+        task_list.clear_cache()
+
         if choice=='1':
             print_all_tasks()
         elif choice=='2':
@@ -1,6 +1,36 @@
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-url = "http://localhost:5000"
+url = os.environ.get("TASK_LIST_URL", "http://localhost:5000")
+timeout = float(os.environ.get("TASK_LIST_TIMEOUT", 5))
+retries = int(os.environ.get("TASK_LIST_RETRIES", 3))
+
+def create_session():
+    # one pooled keep-alive session for every call instead of a new
+    # connection per request; only idempotent methods are retried
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "PUT", "DELETE"])
+        )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+session = create_session()
+
+# the task list is fetched at most once per interaction; writes clear it
+cached_tasks = None
+
+def clear_cache():
+    global cached_tasks
+    cached_tasks = None
 
 def parse_response(response):
     if response.status_code >= 400:
@@ -14,15 +44,31 @@ def create_task(title, description, completed_at=None):
         "description": description,
         "completed_at": completed_at
     }
-    response = requests.post(url+"/tasks",json=query_params)
+    clear_cache()
+    response = session.post(url+"/tasks",json=query_params, timeout=timeout)
     return parse_response(response)
 
 def list_tasks():
-    response = requests.get(url+"/tasks")
-    return response.json()
+    global cached_tasks
+    if cached_tasks is not None:
+        return cached_tasks
+
+    tasks = []
+    query_params = {}
+
+    # follow the cursor until every page has been read
+    while True:
+        response = session.get(url+"/tasks", params=query_params, timeout=timeout)
+        tasks.extend(response.json())
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            cached_tasks = tasks
+            return tasks
+        query_params["cursor"] = next_cursor
 
 def get_task(id):
-    response = requests.get(url+f"/tasks/{id}")
+    response = session.get(url+f"/tasks/{id}", timeout=timeout)
     if response.status_code != 200:
         return None
         
@@ -35,25 +81,31 @@ def update_task(id,title,description):
         "description": description
     }
 
-    response = requests.put(
+    clear_cache()
+    response = session.put(
         url+f"/tasks/{id}",
-        json=query_params
+        json=query_params,
+        timeout=timeout
         )
 
     return parse_response(response)
 
 def delete_task(id):
-    response = requests.delete(url+f"/tasks/{id}")
+    clear_cache()
+    response = session.delete(url+f"/tasks/{id}", timeout=timeout)
+    return response.json()
+
+def delete_all_tasks():
+    clear_cache()
+    response = session.delete(url+"/tasks", json={"all": True}, timeout=timeout)
     return response.json()
 
 def mark_complete(id):
-    response = requests.patch(url+f"/tasks/{id}/mark_complete")
+    clear_cache()
+    response = session.patch(url+f"/tasks/{id}/mark_complete", timeout=timeout)
     return parse_response(response)
 
 def mark_incomplete(id):
-    response = requests.patch(url+f"/tasks/{id}/mark_incomplete")
+    clear_cache()
+    response = session.patch(url+f"/tasks/{id}/mark_incomplete", timeout=timeout)
     return parse_response(response)
-
-
-
-    
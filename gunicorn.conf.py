@@ -0,0 +1,100 @@
+"""Gunicorn settings for serving the API.
+
+    gunicorn -c gunicorn.conf.py 'app:create_app()'
+
+Every setting can be overridden from the environment:
+
+    GUNICORN_WORKER_CLASS  sync (default) for CPU-bound work; gthread, or
+                           gevent if installed, for I/O-bound deployments
+    GUNICORN_WORKERS       defaults to 2 * cores + 1 for sync, cores otherwise
+    GUNICORN_THREADS       threads per gthread worker, default 4
+    GUNICORN_PRELOAD       load the app once in the master before forking, default 1
+    GUNICORN_MAX_REQUESTS  recycle a worker after this many requests, default 1000
+    GUNICORN_TIMEOUT       seconds before a silent worker is killed, default 30
+    GUNICORN_GRACEFUL_TIMEOUT  seconds a worker gets to finish on restart, default 30
+    DATABASE_MAX_CONNECTIONS   connections all workers together may open to
+                               the database, default 80; keep it below the
+                               server's max_connections (100 by default on
+                               PostgreSQL) minus what other clients need
+"""
+from dotenv import load_dotenv
+import multiprocessing
+import os
+import tempfile
+
+# the defaults below must not replace settings made in .env; load_dotenv
+# never overrides a variable that is already set, so read .env first
+load_dotenv()
+
+cores = multiprocessing.cpu_count()
+
+# serving never runs migrations, so skip loading Flask-Migrate and Alembic
+os.environ.setdefault("MIGRATIONS_ENABLED", "0")
+
+# workers share their metrics through files in this directory, a fresh one
+# per master unless set; point `flask dispatch-outbox` at the same directory
+# to include its Slack metrics
+os.environ["METRICS_MULTIPROCESS_DIR"] = (
+    os.environ.get("METRICS_MULTIPROCESS_DIR") or tempfile.mkdtemp(prefix="task-list-metrics-"))
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', 8000)}")
+
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+if worker_class == "sync":
+    workers = int(os.environ.get("GUNICORN_WORKERS", 2 * cores + 1))
+    threads = 1
+else:
+    workers = int(os.environ.get("GUNICORN_WORKERS", cores))
+    threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+# every worker has its own pool, so split the connection budget between them
+# unless the pool is sized explicitly: 2 * cores + 1 workers with the app's
+# defaults of 5 + 10 overflow would open 135 connections on 4 cores
+database_connections = int(os.environ.get("DATABASE_MAX_CONNECTIONS", 80))
+connections_per_worker = max(1, database_connections // workers)
+pool_size = min(5, connections_per_worker)
+os.environ.setdefault("DATABASE_POOL_SIZE", str(pool_size))
+os.environ.setdefault("DATABASE_MAX_OVERFLOW", str(connections_per_worker - pool_size))
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+# recycle workers to bound slow leaks; the jitter keeps them from all
+# restarting at the same moment
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG")
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # with preload_app the forked worker inherits the master's engines; pooled
+    # connections must never be shared across processes, so every worker
+    # starts with empty pools of its own
+    if not server.cfg.preload_app:
+        return
+
+    from app import db
+    from app.database import dispose_engines
+
+    dispose_engines(server.app.wsgi(), db)
+
+
+def worker_exit(server, worker):
+    # write the worker's final counts before it goes away
+    exporter = server.app.wsgi().extensions.get("metrics_exporter")
+    if exporter is not None:
+        exporter.flush(force=True)
+
+
+def child_exit(server, worker):
+    # fold the exited worker's metrics file into the aggregate one, so
+    # recycled workers do not leave a file behind each
+    from app.metrics import merge_exited_process
+
+    merge_exited_process(os.environ["METRICS_MULTIPROCESS_DIR"], worker.pid)
@@ -0,0 +1,35 @@
+"""add task filter indexes
+
+Revision ID: 1692547390a4
+Revises: 64b2f61ff04c
+Create Date: 2026-10-17 13:41:52.207316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1692547390a4'
+down_revision = '64b2f61ff04c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_task_completed_at'), 'task', ['completed_at'], unique=False,
+            postgresql_concurrently=True)
+
+        if op.get_bind().dialect.name == 'postgresql':
+            op.create_index('ix_task_title_pattern', 'task', ['title'], unique=False,
+                postgresql_ops={'title': 'text_pattern_ops'},
+                postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        if op.get_bind().dialect.name == 'postgresql':
+            op.drop_index('ix_task_title_pattern', table_name='task', postgresql_concurrently=True)
+
+        op.drop_index(op.f('ix_task_completed_at'), table_name='task', postgresql_concurrently=True)
@@ -0,0 +1,61 @@
+"""add task search index
+
+Revision ID: 3b9a0f4c1d27
+Revises: 1692547390a4
+Create Date: 2026-10-17 15:02:18.614093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9a0f4c1d27'
+down_revision = '1692547390a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED")
+        op.execute("CREATE INDEX ix_task_search_vector ON task USING gin (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE task_search USING fts5(title, description, "
+            "content='task', content_rowid='task_id', tokenize='porter unicode61')")
+        op.execute(
+            "CREATE TRIGGER task_search_insert AFTER INSERT ON task BEGIN "
+            "INSERT INTO task_search (rowid, title, description) "
+            "VALUES (new.task_id, new.title, new.description); END")
+        op.execute(
+            "CREATE TRIGGER task_search_delete AFTER DELETE ON task BEGIN "
+            "INSERT INTO task_search (task_search, rowid, title, description) "
+            "VALUES ('delete', old.task_id, old.title, old.description); END")
+        op.execute(
+            "CREATE TRIGGER task_search_update AFTER UPDATE OF title, description ON task BEGIN "
+            "INSERT INTO task_search (task_search, rowid, title, description) "
+            "VALUES ('delete', old.task_id, old.title, old.description); "
+            "INSERT INTO task_search (rowid, title, description) "
+            "VALUES (new.task_id, new.title, new.description); END")
+
+        # index the rows that existed before the triggers did
+        op.execute("INSERT INTO task_search (task_search) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.drop_index('ix_task_search_vector', table_name='task')
+        op.drop_column('task', 'search_vector')
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_search_update")
+        op.execute("DROP TRIGGER IF EXISTS task_search_delete")
+        op.execute("DROP TRIGGER IF EXISTS task_search_insert")
+        op.execute("DROP TABLE IF EXISTS task_search")
@@ -0,0 +1,36 @@
+"""add task indexes
+
+Revision ID: e73e8208b5ec
+Revises: 5855785b99ad
+Create Date: 2026-10-17 10:03:27.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e73e8208b5ec'
+down_revision = '5855785b99ad'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # build the indexes without blocking writes to the task table on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_task_goal_id'), 'task', ['goal_id'], unique=False,
+            postgresql_concurrently=True)
+        op.create_index('ix_task_title_task_id', 'task', ['title', 'task_id'], unique=False,
+            postgresql_concurrently=True)
+        op.create_index('ix_task_incomplete', 'task', ['task_id'], unique=False,
+            postgresql_where=sa.text('completed_at IS NULL'),
+            sqlite_where=sa.text('completed_at IS NULL'),
+            postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_task_incomplete', table_name='task', postgresql_concurrently=True)
+        op.drop_index('ix_task_title_task_id', table_name='task', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_task_goal_id'), table_name='task', postgresql_concurrently=True)
@@ -0,0 +1,84 @@
+from app.models.task import Task
+import json
+import pytest
+
+
+def test_create_tasks_in_bulk(client):
+    # Act
+    response = client.post("/tasks/bulk", json=[
+        {"title": "First", "description": "One"},
+        {"title": "Second", "description": "Two", "completed_at": "2022-05-09T08:52:16"},
+        {"title": "Third", "description": "Three", "completed_at": None}
+    ])
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 201
+    assert response_body == {"task_ids": [1, 2, 3]}
+    assert [task.title for task in Task.query.order_by(Task.task_id)] == ["First", "Second", "Third"]
+    assert Task.query.get(2).completed_at
+    assert Task.query.get(3).completed_at is None
+
+
+def test_create_tasks_in_bulk_after_existing_tasks(client, three_tasks):
+    # Act
+    response = client.post("/tasks/bulk", json=[
+        {"title": f"Task {i}", "description": ""} for i in range(2500)
+    ])
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 201
+    assert response_body["task_ids"] == list(range(4, 2504))
+    assert Task.query.get(2503).title == "Task 2499"
+
+
+def test_create_tasks_in_bulk_ndjson(client):
+    # Arrange
+    lines = [json.dumps({"title": "First", "description": ""}), json.dumps({"title": "Second", "description": ""})]
+
+    # Act
+    response = client.post("/tasks/bulk", data="\n".join(lines) + "\n",
+        content_type="application/x-ndjson")
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 201
+    assert response_body == {"task_ids": [1, 2]}
+
+
+def test_create_tasks_in_bulk_validates_every_task(client):
+    # Act
+    response = client.post("/tasks/bulk", json=[
+        {"title": "Valid", "description": ""},
+        {"title": "No description"},
+        {"title": "Bad date", "description": "", "completed_at": "not a date"},
+        "not a task",
+        {"title": {"a": 1}, "description": ""},
+        {"title": None, "description": 5}
+    ])
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {
+        "details": "Invalid data",
+        "errors": [
+            {"index": 1, "error": "missing description"},
+            {"index": 2, "error": "not a date is an invalid completed_at date"},
+            {"index": 3, "error": "expected a task object"},
+            {"index": 4, "error": "title must be a string"},
+            {"index": 5, "error": "description must be a string"}
+        ]
+    }
+    assert Task.query.count() == 0
+
+
+def test_create_tasks_in_bulk_expects_list(client):
+    # Act
+    response = client.post("/tasks/bulk", json={"title": "Single", "description": ""})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"details": "Expected list of tasks"}
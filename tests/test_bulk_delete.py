@@ -0,0 +1,82 @@
+from app.models.task import Task
+from app import db
+from datetime import datetime
+import pytest
+
+
+@pytest.fixture
+def mixed_tasks(app, one_task_belongs_to_one_goal):
+    db.session.add_all([
+        Task(title="Done", description="", completed_at=datetime.utcnow()),
+        Task(title="Not done", description="", completed_at=None)
+    ])
+    db.session.commit()
+
+
+def test_delete_tasks_by_ids(client, three_tasks):
+    # Act
+    response = client.delete("/tasks", json={"task_ids": [1, 3, 5]})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body == {"details": "2 tasks successfully deleted", "count": 2}
+    assert [task.task_id for task in Task.query.all()] == [2]
+
+
+def test_delete_tasks_by_filter(client, mixed_tasks):
+    # Act
+    response = client.delete("/tasks", json={"filter": {"goal_id": None, "is_complete": False}})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body["count"] == 1
+    assert [task.title for task in Task.query.order_by(Task.task_id)] == ["Go on my daily walk 🏞", "Done"]
+
+
+def test_delete_all_tasks(client, mixed_tasks):
+    # Act
+    response = client.delete("/tasks", json={"all": True})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body == {"details": "3 tasks successfully deleted", "count": 3}
+    assert Task.query.count() == 0
+
+
+def test_delete_tasks_requires_selection(client, three_tasks):
+    # Act
+    response = client.delete("/tasks", json={})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"details": "Expected task_ids, filter or all"}
+    assert Task.query.count() == 3
+
+
+def test_delete_tasks_unknown_filter(client, three_tasks):
+    # Act
+    response = client.delete("/tasks", json={"filter": {"color": "red"}})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"details": "Unknown filter color"}
+
+
+@pytest.mark.parametrize("request_body, error", [
+    ({"task_ids": [None]}, "None is an invalid ID. ID must be an integer."),
+    ({"task_ids": [1.5]}, "1.5 is an invalid ID. ID must be an integer."),
+    ({"filter": {"goal_id": [1]}}, "[1] is an invalid ID. ID must be an integer.")
+])
+def test_delete_tasks_invalid_ids(client, three_tasks, request_body, error):
+    # Act
+    response = client.delete("/tasks", json=request_body)
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error}
+    assert Task.query.count() == 3
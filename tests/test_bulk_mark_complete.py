@@ -0,0 +1,102 @@
+from app.models.outbox_message import OutboxMessage
+from app.models.task import Task
+from app import db
+from datetime import datetime
+import pytest
+
+
+def test_mark_tasks_complete_by_ids(client, three_tasks):
+    # Act
+    response = client.patch("/tasks/mark_complete", json={"task_ids": [1, 3, 5]})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body["count"] == 2
+    assert [task["id"] for task in response_body["tasks"]] == [1, 3]
+    assert all(task["is_complete"] for task in response_body["tasks"])
+
+    completed_at = {task.task_id: task.completed_at for task in Task.query.all()}
+    assert completed_at[2] is None
+    assert completed_at[1] is not None
+    assert completed_at[1] == completed_at[3]
+
+
+def test_mark_tasks_complete_sends_one_notification(client, three_tasks):
+    # Act
+    client.patch("/tasks/mark_complete", json={"all": True})
+
+    # Assert
+    messages = OutboxMessage.query.all()
+    assert len(messages) == 1
+    assert messages[0].text == ("Someone just completed 3 tasks: Water the garden 🌷, "
+        "Answer forgotten email 📧, Pay my outstanding tickets 😭")
+
+
+def test_mark_tasks_complete_by_filter(client, one_task_belongs_to_one_goal):
+    # Arrange
+    db.session.add(Task(title="Unassigned", description="", completed_at=None))
+    db.session.commit()
+
+    # Act
+    response = client.patch("/tasks/mark_complete", json={"filter": {"goal_id": 1, "is_complete": False}})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body["count"] == 1
+    assert response_body["tasks"][0]["goal_id"] == 1
+    assert Task.query.get(2).completed_at is None
+    assert OutboxMessage.query.one().text == "Someone just completed the task Go on my daily walk 🏞"
+
+
+def test_mark_tasks_complete_without_matches(client, three_tasks):
+    # Act
+    response = client.patch("/tasks/mark_complete", json={"task_ids": [7]})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body == {"tasks": [], "count": 0}
+    assert OutboxMessage.query.count() == 0
+
+
+def test_mark_tasks_incomplete_by_filter(client, three_tasks):
+    # Arrange
+    for task in Task.query.filter(Task.task_id != 2):
+        task.completed_at = datetime.utcnow()
+    db.session.commit()
+
+    # Act
+    response = client.patch("/tasks/mark_incomplete", json={"filter": {"is_complete": True}})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body["count"] == 2
+    assert [task["id"] for task in response_body["tasks"]] == [1, 3]
+    assert not any(task["is_complete"] for task in response_body["tasks"])
+    assert Task.query.filter(Task.completed_at.isnot(None)).count() == 0
+    assert OutboxMessage.query.count() == 0
+
+
+def test_mark_tasks_complete_requires_selection(client, three_tasks):
+    # Act
+    response = client.patch("/tasks/mark_complete", json={})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"details": "Expected task_ids, filter or all"}
+    assert Task.query.filter(Task.completed_at.isnot(None)).count() == 0
+
+
+@pytest.mark.parametrize("path", ["/tasks/mark_complete", "/tasks/mark_incomplete"])
+def test_mark_tasks_invalid_ids(client, three_tasks, path):
+    # Act
+    response = client.patch(path, json={"task_ids": [{"a": 1}]})
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "{'a': 1} is an invalid ID. ID must be an integer."}
+    assert OutboxMessage.query.count() == 0
@@ -0,0 +1,106 @@
+from app import create_app
+from app.database import build_engine_options, get_pool_stats
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool, QueuePool
+import pytest
+
+
+@pytest.fixture
+def database_config():
+    config = create_app({"TESTING": True}).config
+    config["SQLALCHEMY_DATABASE_URI"] = "postgresql+psycopg2://localhost/task_list_api"
+    return config
+
+
+def test_engine_options_default_profile(database_config):
+    # Arrange
+    database_config["DATABASE_POOL_SIZE"] = 8
+    database_config["DATABASE_STATEMENT_TIMEOUT"] = 5000
+
+    # Act
+    options = build_engine_options(database_config)
+
+    # Assert
+    assert options == {
+        "pool_size": 8,
+        "max_overflow": 10,
+        "pool_timeout": 10.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "connect_args": {
+            "application_name": "task-list-api",
+            "options": "-c statement_timeout=5000"
+        }
+    }
+
+
+def test_engine_options_pgbouncer_profile(database_config):
+    # Arrange
+    database_config["DATABASE_POOL_PROFILE"] = "pgbouncer"
+
+    # Act
+    options = build_engine_options(database_config)
+
+    # Assert
+    assert options == {
+        "poolclass": NullPool,
+        "connect_args": {"application_name": "task-list-api"},
+        "execution_options": {"local_statement_timeout": 30000}
+    }
+
+
+def test_engine_options_skip_pool_for_sqlite(database_config):
+    # Arrange
+    database_config["SQLALCHEMY_DATABASE_URI"] = "sqlite:////tmp/task_list.db"
+
+    # Act
+    options = build_engine_options(database_config)
+
+    # Assert
+    assert options == {}
+
+
+def test_engine_options_can_be_overridden():
+    # Act
+    app = create_app({"TESTING": True, "SQLALCHEMY_ENGINE_OPTIONS": {"echo": True}})
+
+    # Assert
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == {"echo": True}
+
+
+def test_pool_stats_of_queue_pool(tmp_path):
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=QueuePool, pool_size=3, max_overflow=2)
+    connection = engine.connect()
+
+    # Act
+    stats = get_pool_stats(engine)
+    connection.close()
+
+    # Assert
+    assert stats == {"pool": "QueuePool", "size": 3, "checked_in": 0, "checked_out": 1, "overflow": 0}
+
+
+def test_metrics_expose_pool_stats(client, one_task):
+    # Act
+    response = client.get("/metrics")
+
+    # Assert
+    assert "# TYPE task_list_db_pool_checked_out gauge" in response.get_data(as_text=True)
+
+
+def test_pool_replaces_connections_of_other_processes(tmp_path):
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=QueuePool, pool_size=1)
+    connection = engine.connect()
+    inherited = connection.connection.connection
+    connection.connection._connection_record.info["pid"] = -1
+    connection.close()
+
+    # Act
+    connection = engine.connect()
+
+    # Assert
+    assert connection.connection.connection is not inherited
+    assert connection.execute("SELECT 1").scalar() == 1
+    connection.close()
@@ -0,0 +1,96 @@
+import pytest
+
+
+def test_get_tasks_not_modified(client, three_tasks):
+    # Arrange
+    etag = client.get("/tasks").headers["ETag"]
+
+    # Act
+    response = client.get("/tasks", headers={"If-None-Match": etag})
+
+    # Assert
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.get_data() == b""
+
+
+@pytest.mark.parametrize("accept", ["application/json", "application/x-ndjson"])
+def test_get_tasks_varies_on_accept(client, three_tasks, accept):
+    # Act
+    response = client.get("/tasks", headers={"Accept": accept})
+    not_modified_response = client.get("/tasks",
+        headers={"Accept": accept, "If-None-Match": response.headers["ETag"]})
+
+    # Assert
+    assert response.headers["Vary"] == "Accept"
+    assert not_modified_response.headers["Vary"] == "Accept"
+
+
+def test_get_task_etag_depends_on_query(client, three_tasks):
+    # Act
+    unsorted_etag = client.get("/tasks").headers["ETag"]
+    sorted_response = client.get("/tasks?sort=asc", headers={"If-None-Match": unsorted_etag})
+
+    # Assert
+    assert sorted_response.status_code == 200
+    assert sorted_response.headers["ETag"] != unsorted_etag
+
+
+@pytest.mark.parametrize("method, path, json", [
+    ("post", "/tasks", {"title": "New", "description": ""}),
+    ("post", "/tasks/bulk", [{"title": "New", "description": ""}]),
+    ("put", "/tasks/1", {"title": "Changed", "description": ""}),
+    ("patch", "/tasks/1/mark_complete", None),
+    ("patch", "/tasks/1/mark_incomplete", None),
+    ("delete", "/tasks/1", None),
+    ("delete", "/tasks", {"task_ids": [2]}),
+    ("post", "/goals/1/tasks", {"task_ids": [1]}),
+    ("delete", "/goals/1", None)
+])
+def test_task_writes_invalidate_etags(client, one_goal, three_tasks, method, path, json):
+    # Arrange
+    tasks_etag = client.get("/tasks").headers["ETag"]
+    task_etag = client.get("/tasks/1").headers["ETag"]
+
+    # Act
+    write_response = getattr(client, method)(path, json=json)
+    tasks_response = client.get("/tasks", headers={"If-None-Match": tasks_etag})
+    task_response = client.get("/tasks/1", headers={"If-None-Match": task_etag})
+
+    # Assert
+    assert write_response.status_code < 400
+    assert tasks_response.status_code == 200
+    assert task_response.status_code in (200, 404)
+
+
+@pytest.mark.parametrize("method, path, json", [
+    ("post", "/goals", {"title": "New"}),
+    ("put", "/goals/1", {"title": "Changed"}),
+    ("delete", "/goals/1", None)
+])
+def test_goal_writes_invalidate_etags(client, one_goal, method, path, json):
+    # Arrange
+    goals_etag = client.get("/goals").headers["ETag"]
+
+    # Act
+    write_response = getattr(client, method)(path, json=json)
+    goals_response = client.get("/goals", headers={"If-None-Match": goals_etag})
+
+    # Assert
+    assert write_response.status_code < 400
+    assert goals_response.status_code == 200
+
+
+def test_goal_tasks_etag_changes_with_tasks(client, one_task_belongs_to_one_goal):
+    # Arrange
+    etag = client.get("/goals/1/tasks").headers["ETag"]
+
+    # Act
+    not_modified_response = client.get("/goals/1/tasks", headers={"If-None-Match": etag})
+    client.patch("/tasks/1/mark_complete")
+    modified_response = client.get("/goals/1/tasks", headers={"If-None-Match": etag})
+
+    # Assert
+    assert not_modified_response.status_code == 304
+    assert modified_response.status_code == 200
+    assert modified_response.get_json()["tasks"][0]["is_complete"] == True
@@ -0,0 +1,97 @@
+from app.models.task import Task
+from app.models.goal import Goal
+from app import db
+from sqlalchemy import event
+import pytest
+
+
+@pytest.fixture
+def goals_with_tasks(app):
+    db.session.add_all([Goal(title="First goal"), Goal(title="Second goal"), Goal(title="Empty goal")])
+    db.session.add_all([
+        Task(title=f"Task {i}", description="", completed_at=None, goal_id=1 if i < 3 else 2)
+        for i in range(5)
+    ])
+    db.session.commit()
+
+
+def test_get_goals_include_tasks(client, goals_with_tasks):
+    # Act
+    response = client.get("/goals?include=tasks")
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert [len(goal["tasks"]) for goal in response_body] == [3, 2, 0]
+    assert response_body[1] == {
+        "id": 2,
+        "title": "Second goal",
+        "tasks": [
+            {"id": 4, "goal_id": 2, "title": "Task 3", "description": "", "is_complete": False},
+            {"id": 5, "goal_id": 2, "title": "Task 4", "description": "", "is_complete": False}
+        ],
+        "tasks_truncated": False
+    }
+
+
+def test_get_goals_include_tasks_single_task_query(app, client, goals_with_tasks):
+    # Arrange
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.get_engine(app), "before_cursor_execute", record)
+
+    # Act
+    client.get("/goals?include=tasks")
+    event.remove(db.get_engine(app), "before_cursor_execute", record)
+
+    # Assert
+    assert len([statement for statement in statements if "FROM task" in statement]) == 1
+
+
+def test_get_goals_include_tasks_limit(client, goals_with_tasks):
+    # Act
+    response = client.get("/goals?include=tasks&tasks_limit=2")
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert [[task["id"] for task in goal["tasks"]] for goal in response_body] == [[1, 2], [4, 5], []]
+    assert [goal["tasks_truncated"] for goal in response_body] == [True, False, False]
+
+
+def test_get_specific_goal_include_tasks(client, goals_with_tasks):
+    # Act
+    response = client.get("/goals/1?include=tasks&tasks_limit=1")
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body == {
+        "goal": {
+            "id": 1,
+            "title": "First goal",
+            "tasks": [{"id": 1, "goal_id": 1, "title": "Task 0", "description": "", "is_complete": False}],
+            "tasks_truncated": True
+        }
+    }
+
+
+def test_get_goals_include_tasks_negative_limit(client, goals_with_tasks):
+    # Act
+    response = client.get("/goals?include=tasks&tasks_limit=-1")
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "-1 is an invalid tasks_limit. tasks_limit must be at least 0."}
+
+
+def test_get_goals_include_unknown(client, goals_with_tasks):
+    # Act
+    response = client.get("/goals?include=owners")
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "owners cannot be included. Only tasks can be included."}
@@ -0,0 +1,87 @@
+from app.models.task import Task
+from app.models.goal import Goal
+from app import db
+from sqlalchemy import event
+import pytest
+
+
+@pytest.fixture
+def many_tasks(app):
+    db.session.add_all([
+        Task(title=f"Task {i}", description="", completed_at=None) for i in range(50)
+    ])
+    db.session.commit()
+
+
+def count_statements(app, send_request):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_engine(app)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = send_request()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    return response, statements
+
+
+def test_post_many_task_ids_to_goal_constant_queries(app, client, one_goal, many_tasks):
+    # Act
+    few_response, few_statements = count_statements(
+        app, lambda: client.post("/goals/1/tasks", json={"task_ids": [1, 2]}))
+    many_response, many_statements = count_statements(
+        app, lambda: client.post("/goals/1/tasks", json={"task_ids": list(range(1, 51))}))
+
+    # Assert
+    assert few_response.status_code == 200
+    assert many_response.status_code == 200
+    assert many_response.get_json() == {"id": 1, "task_ids": list(range(1, 51))}
+    assert len(many_statements) == len(few_statements)
+    assert len(Goal.query.get(1).tasks) == 50
+
+
+def test_post_task_ids_to_goal_reports_all_missing_tasks(client, one_goal, three_tasks):
+    # Act
+    response = client.post("/goals/1/tasks", json={"task_ids": [1, 7, 2, 9]})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 404
+    assert response_body == {"error": "tasks 7, 9 not found"}
+    assert Goal.query.get(1).tasks == []
+
+
+def test_post_task_ids_to_goal_one_missing_task(client, one_goal, three_tasks):
+    # Act
+    response = client.post("/goals/1/tasks", json={"task_ids": [1, 4]})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 404
+    assert response_body == {"error": "task 4 not found"}
+
+
+def test_post_duplicate_task_ids_to_goal(client, one_goal, three_tasks):
+    # Act
+    response = client.post("/goals/1/tasks", json={"task_ids": [3, 1, 3]})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert response_body == {"id": 1, "task_ids": [1, 3]}
+
+
+@pytest.mark.parametrize("task_id", [None, True, [1], {"a": 1}])
+def test_post_invalid_task_ids_to_goal(client, one_goal, three_tasks, task_id):
+    # Act
+    response = client.post("/goals/1/tasks", json={"task_ids": [1, task_id]})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"error": f"{task_id} is an invalid ID. ID must be an integer."}
+    assert Goal.query.get(1).tasks == []
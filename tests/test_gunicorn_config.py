@@ -0,0 +1,57 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+SETTINGS = ["DATABASE_POOL_SIZE", "DATABASE_MAX_OVERFLOW", "MIGRATIONS_ENABLED", "METRICS_MULTIPROCESS_DIR"]
+
+LOAD_CONFIG = """
+import json, os, runpy, sys
+runpy.run_path(sys.argv[1])
+print(json.dumps({name: os.environ.get(name) for name in sys.argv[2:]}))
+"""
+
+
+def load_config(directory):
+    # load the config next to its .env in a fresh interpreter, so neither the
+    # settings nor load_dotenv leak between tests
+    config_path = directory / "gunicorn.conf.py"
+    shutil.copy(CONFIG_PATH, config_path)
+    env = {name: value for name, value in os.environ.items() if name not in SETTINGS}
+    env["TMPDIR"] = str(directory / "tmp")
+    os.mkdir(env["TMPDIR"])
+
+    result = subprocess.run([sys.executable, "-c", LOAD_CONFIG, str(config_path), *SETTINGS],
+        env=env, cwd=directory, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def test_settings_in_dotenv_are_kept(tmp_path):
+    # Arrange
+    (tmp_path / ".env").write_text(
+        "DATABASE_POOL_SIZE=3\nDATABASE_MAX_OVERFLOW=0\nMIGRATIONS_ENABLED=1\n"
+        f"METRICS_MULTIPROCESS_DIR={tmp_path / 'metrics'}\n")
+
+    # Act
+    settings = load_config(tmp_path)
+
+    # Assert
+    assert settings == {
+        "DATABASE_POOL_SIZE": "3",
+        "DATABASE_MAX_OVERFLOW": "0",
+        "MIGRATIONS_ENABLED": "1",
+        "METRICS_MULTIPROCESS_DIR": str(tmp_path / "metrics")
+    }
+    assert os.listdir(tmp_path / "tmp") == []
+
+
+def test_defaults_without_dotenv(tmp_path):
+    # Act
+    settings = load_config(tmp_path)
+
+    # Assert
+    assert settings["MIGRATIONS_ENABLED"] == "0"
+    assert int(settings["DATABASE_POOL_SIZE"]) <= 5
+    assert os.path.dirname(settings["METRICS_MULTIPROCESS_DIR"]) == str(tmp_path / "tmp")
@@ -0,0 +1,145 @@
+from app import create_app, db
+from app.metrics import merge_exited_process, merge_snapshots, record_slack_call, render
+import json
+import os
+import pytest
+
+
+def read_metrics(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return response.get_data(as_text=True).splitlines()
+
+
+def find_sample(lines, name, **labels):
+    labels = [f'{key}="{value}"' for key, value in labels.items()]
+    samples = [line for line in lines
+        if line.startswith(name + "{") and all(label in line for label in labels)]
+    assert len(samples) == 1, samples
+    return float(samples[0].rsplit(" ", 1)[1])
+
+
+def test_metrics_count_requests_by_route_and_status(client, one_task):
+    # Act
+    client.get("/tasks")
+    client.get("/tasks/1")
+    client.get("/tasks/2")
+    lines = read_metrics(client)
+
+    # Assert
+    assert find_sample(lines, "task_list_http_requests_total", method="GET", route="/tasks", status="200") == 1
+    assert find_sample(lines, "task_list_http_requests_total",
+        method="GET", route="/tasks/<task_id>", status="200") == 1
+    assert find_sample(lines, "task_list_http_requests_total",
+        method="GET", route="/tasks/<task_id>", status="404") == 1
+    assert not [line for line in lines if 'route="/metrics"' in line]
+
+
+def test_metrics_record_latency_and_sql(client, one_task):
+    # Act
+    client.get("/tasks")
+    lines = read_metrics(client)
+
+    # Assert
+    assert "# TYPE task_list_http_request_duration_seconds histogram" in lines
+    assert find_sample(lines, "task_list_http_request_duration_seconds_count", method="GET", route="/tasks") == 1
+    assert find_sample(lines, "task_list_http_request_duration_seconds_bucket",
+        method="GET", route="/tasks", le="+Inf") == 1
+    assert find_sample(lines, "task_list_sql_statements_per_request_sum", method="GET", route="/tasks") >= 1
+    assert find_sample(lines, "task_list_db_duration_seconds_sum", method="GET", route="/tasks") > 0
+
+
+def test_metrics_record_pool_checkout_wait(client, one_task):
+    # Act
+    client.get("/tasks")
+    client.get("/tasks")
+    lines = read_metrics(client)
+
+    # Assert
+    assert find_sample(lines, "task_list_pool_checkout_wait_seconds_count") >= 1
+
+
+def test_metrics_record_slack_calls(app, client):
+    # Act
+    record_slack_call(app, 0.2, "sent")
+    record_slack_call(app, 3.0, "retry")
+    lines = read_metrics(client)
+
+    # Assert
+    assert find_sample(lines, "task_list_slack_request_duration_seconds_count", outcome="sent") == 1
+    assert find_sample(lines, "task_list_slack_request_duration_seconds_bucket", outcome="retry", le="2.5") == 0
+    assert find_sample(lines, "task_list_slack_failures_total", outcome="retry") == 1
+
+
+def test_metrics_aggregate_worker_files(tmp_path):
+    # Arrange
+    app = create_app({"TESTING": True, "METRICS_MULTIPROCESS_DIR": str(tmp_path)})
+    other_worker = {
+        "counters": [["task_list_http_requests_total",
+            [["method", "GET"], ["route", "/goals"], ["status", "200"]], 4]],
+        "histograms": []
+    }
+    (tmp_path / "metrics-1.json").write_text(json.dumps(other_worker))
+
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+
+        # Act
+        client.get("/goals")
+        lines = read_metrics(client)
+
+        db.drop_all()
+
+    # Assert
+    assert find_sample(lines, "task_list_http_requests_total", method="GET", route="/goals", status="200") == 5
+    assert not [line for line in lines if "pid=" in line]
+    assert os.path.exists(tmp_path / f"metrics-{os.getpid()}.json")
+
+
+def test_exited_workers_merge_into_aggregate_file(tmp_path):
+    # Arrange
+    app = create_app({"TESTING": True, "METRICS_MULTIPROCESS_DIR": str(tmp_path)})
+    for pid, count in [(1, 4), (2, 3)]:
+        exited_worker = {
+            "counters": [["task_list_http_requests_total",
+                [["method", "GET"], ["route", "/goals"], ["status", "200"]], count]],
+            "histograms": [["task_list_sql_statements_per_request",
+                [["method", "GET"], ["route", "/goals"]], [0, count, 0, 0, 0, 0, 0, 0], 2.0 * count, count]]
+        }
+        (tmp_path / f"metrics-{pid}.json").write_text(json.dumps(exited_worker))
+
+    # Act
+    merge_exited_process(str(tmp_path), 1)
+    merge_exited_process(str(tmp_path), 2)
+    merge_exited_process(str(tmp_path), 3)
+
+    with app.app_context():
+        lines = read_metrics(app.test_client())
+
+    # Assert
+    assert set(os.listdir(tmp_path)) == {"metrics-aggregate.json", f"metrics-{os.getpid()}.json"}
+    assert find_sample(lines, "task_list_http_requests_total", method="GET", route="/goals", status="200") == 7
+    assert find_sample(lines, "task_list_sql_statements_per_request_count", route="/goals") == 7
+
+
+def test_metrics_disabled():
+    # Arrange
+    app = create_app({"TESTING": True, "METRICS_ENABLED": False})
+
+    # Act
+    response = app.test_client().get("/metrics")
+
+    # Assert
+    assert response.status_code == 404
+
+
+def test_render_escapes_labels():
+    # Act
+    counters, histograms = merge_snapshots([{
+        "counters": [["task_list_slack_failures_total", [["outcome", 'a "b"\\']], 2]],
+        "histograms": []
+    }])
+
+    # Assert
+    assert 'task_list_slack_failures_total{outcome="a \\"b\\"\\\\"} 2' in render(counters, histograms)
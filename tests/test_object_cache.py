@@ -0,0 +1,149 @@
+from app import create_app, db
+from app.cache import LocalCache
+from app.models.task import Task
+from flask.signals import request_finished
+import pytest
+
+
+@pytest.fixture(params=["local", "dict"])
+def cached_app(request):
+    app = create_app({"TESTING": True, "OBJECT_CACHE_BACKEND": request.param})
+
+    @request_finished.connect_via(app)
+    def expire_session(sender, response, **extra):
+        db.session.remove()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Task(title="Cached task", description="", completed_at=None))
+        db.session.commit()
+        yield app
+
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def cached_client(cached_app):
+    return cached_app.test_client()
+
+
+def test_repeated_reads_hit_cache(cached_app, cached_client):
+    # Act
+    first_response = cached_client.get("/tasks/1")
+    second_response = cached_client.get("/tasks/1")
+
+    # Assert
+    assert first_response.get_json() == second_response.get_json()
+    assert cached_app.extensions["object_cache"].stats()["hits"] == 1
+    assert cached_app.extensions["object_cache"].stats()["misses"] == 1
+
+
+def test_write_through_cached_object(cached_client):
+    # Arrange
+    cached_client.get("/tasks/1")
+
+    # Act
+    response = cached_client.put("/tasks/1", json={"title": "Updated", "description": "New"})
+    read_response = cached_client.get("/tasks/1")
+
+    # Assert
+    assert response.status_code == 200
+    assert read_response.get_json()["task"]["title"] == "Updated"
+    assert Task.query.get(1).title == "Updated"
+
+
+@pytest.mark.parametrize("method, path, json, field, expected", [
+    ("patch", "/tasks/1/mark_complete", None, "is_complete", True),
+    ("post", "/goals/2/tasks", {"task_ids": [1]}, "goal_id", 2),
+    ("delete", "/goals/1", None, "goal_id", None)
+])
+def test_writes_invalidate_cached_task(cached_client, method, path, json, field, expected):
+    # Arrange
+    cached_client.post("/goals", json={"title": "First goal"})
+    cached_client.post("/goals", json={"title": "Second goal"})
+    cached_client.post("/goals/1/tasks", json={"task_ids": [1]})
+    cached_client.get("/tasks/1")
+
+    # Act
+    getattr(cached_client, method)(path, json=json)
+    response_body = cached_client.get("/tasks/1").get_json()
+
+    # Assert
+    assert response_body["task"].get(field) == expected
+
+
+def test_delete_invalidates_cached_task(cached_client):
+    # Arrange
+    cached_client.get("/tasks/1")
+
+    # Act
+    cached_client.delete("/tasks/1")
+    response = cached_client.get("/tasks/1")
+
+    # Assert
+    assert response.status_code == 404
+
+
+def test_write_in_another_worker_is_not_served_from_cache(tmp_path):
+    # Arrange: two workers with their own local caches share one database
+    config = {"TESTING": True, "OBJECT_CACHE_BACKEND": "local",
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/tasks.db"}
+    worker_a = create_app(config)
+    worker_b = create_app(config)
+    with worker_a.app_context():
+        db.create_all()
+        db.session.add(Task(title="Cached task", description="", completed_at=None))
+        db.session.commit()
+        db.session.remove()
+
+    client_a = worker_a.test_client()
+    client_b = worker_b.test_client()
+    client_b.get("/tasks/1")
+
+    # Act
+    client_a.put("/tasks/1", json={"title": "Updated", "description": ""})
+    response = client_b.get("/tasks/1")
+    revalidated_response = client_b.get("/tasks/1", headers={"If-None-Match": response.headers["ETag"]})
+
+    # Assert
+    assert response.get_json()["task"]["title"] == "Updated"
+    assert revalidated_response.status_code == 304
+
+
+def test_cache_lookups_are_reported_in_metrics(cached_client):
+    # Act
+    cached_client.get("/tasks/1")
+    cached_client.get("/tasks/1")
+    lines = cached_client.get("/metrics").get_data(as_text=True).splitlines()
+    lookups = [line for line in lines if line.startswith("task_list_object_cache_lookups_total{")]
+
+    # Assert
+    assert len(lookups) == 2
+    assert [line for line in lookups if 'result="hit"' in line and line.endswith(" 1")]
+    assert [line for line in lookups if 'result="miss"' in line and line.endswith(" 1")]
+
+
+def test_local_cache_is_bounded():
+    # Arrange
+    local_cache = LocalCache(max_size=2, ttl=30)
+
+    # Act
+    for id in range(3):
+        local_cache.set("task", id, {"task_id": id})
+
+    # Assert
+    assert local_cache.get("task", 0) is None
+    assert local_cache.get("task", 2) == {"task_id": 2}
+    assert local_cache.evictions == 1
+
+
+def test_local_cache_entries_expire():
+    # Arrange
+    local_cache = LocalCache(max_size=2, ttl=-1)
+
+    # Act
+    local_cache.set("task", 1, {"task_id": 1})
+
+    # Assert
+    assert local_cache.get("task", 1) is None
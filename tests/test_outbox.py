@@ -0,0 +1,124 @@
+from app.models.outbox_message import OutboxMessage
+from app.outbox import OutboxDispatcher, parse_retry_after
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+import datetime
+import json
+import threading
+import pytest
+
+
+class FakeSlackHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.server.received.append(parse_qs(urlparse(self.path).query))
+        status, headers, body = self.server.responses.pop(0) if self.server.responses else (200, {}, {"ok": True})
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+# This fixture runs a local HTTP stand-in for the Slack API
+# and points the app's outbox dispatcher at it
+@pytest.fixture
+def slack_server(app):
+    server = HTTPServer(("127.0.0.1", 0), FakeSlackHandler)
+    server.received = []
+    server.responses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    app.config["SLACK_API_URL"] = f"http://127.0.0.1:{server.server_port}/api/chat.postMessage"
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def dispatcher(app, slack_server):
+    dispatcher = OutboxDispatcher(app)
+    yield dispatcher
+    dispatcher.stop()
+
+
+def test_mark_complete_writes_outbox_message(client, one_task):
+    # Act
+    response = client.patch("/tasks/1/mark_complete")
+
+    # Assert
+    assert response.status_code == 200
+    messages = OutboxMessage.query.all()
+    assert len(messages) == 1
+    assert messages[0].channel == "task-notifications"
+    assert messages[0].text == "Someone just completed the task Go on my daily walk 🏞"
+    assert messages[0].sent_at is None
+
+
+def test_dispatcher_sends_pending_message(client, one_task, slack_server, dispatcher):
+    # Arrange
+    client.patch("/tasks/1/mark_complete")
+
+    # Act
+    sent = dispatcher.drain()
+
+    # Assert
+    assert sent == 1
+    assert slack_server.received == [{
+        "channel": ["task-notifications"],
+        "text": ["Someone just completed the task Go on my daily walk 🏞"]
+    }]
+    message = OutboxMessage.query.get(1)
+    assert message.sent_at
+    assert message.attempts == 1
+    assert dispatcher.drain() == 0
+
+
+def test_dispatcher_honours_retry_after(client, one_task, slack_server, dispatcher):
+    # Arrange
+    slack_server.responses.append((429, {"Retry-After": "120"}, {"ok": False, "error": "ratelimited"}))
+    client.patch("/tasks/1/mark_complete")
+
+    # Act
+    dispatcher.drain()
+
+    # Assert
+    message = OutboxMessage.query.get(1)
+    assert message.sent_at is None
+    assert message.failed_at is None
+    assert message.last_error == "HTTP 429"
+    assert message.next_attempt_at - datetime.datetime.utcnow() > datetime.timedelta(seconds=100)
+    assert dispatcher.drain() == 0
+
+
+def test_dispatcher_gives_up_after_max_attempts(app, client, one_task, slack_server, dispatcher):
+    # Arrange
+    dispatcher.max_attempts = 2
+    dispatcher.backoff_base = 0
+    slack_server.responses.extend([
+        (500, {}, {"ok": False}),
+        (200, {}, {"ok": False, "error": "channel_not_found"})
+    ])
+    client.patch("/tasks/1/mark_complete")
+
+    # Act
+    dispatcher.drain()
+    dispatcher.drain()
+
+    # Assert
+    message = OutboxMessage.query.get(1)
+    assert message.attempts == 2
+    assert message.failed_at
+    assert message.last_error == "channel_not_found"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("30") == 30
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
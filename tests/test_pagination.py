@@ -0,0 +1,149 @@
+from app.models.task import Task
+from app.models.goal import Goal
+from app import db
+from app.routes import encode_cursor
+import pytest
+
+
+@pytest.fixture
+def five_tasks(app):
+    db.session.add_all([
+        Task(title="B task", description="", completed_at=None),
+        Task(title="A task", description="", completed_at=None),
+        Task(title="B task", description="", completed_at=None),
+        Task(title="C task", description="", completed_at=None),
+        Task(title="A task", description="", completed_at=None)
+    ])
+    db.session.commit()
+
+
+def read_all_pages(client, path, query_params):
+    pages = []
+    response = client.get(path, query_string=query_params)
+
+    while True:
+        assert response.status_code == 200
+        pages.append(response.get_json())
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            return pages
+        response = client.get(path, query_string=dict(query_params, cursor=next_cursor))
+
+
+def test_get_tasks_paginated_by_id(client, five_tasks):
+    # Act
+    pages = read_all_pages(client, "/tasks", {"limit": 2})
+
+    # Assert
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [task["id"] for page in pages for task in page] == [1, 2, 3, 4, 5]
+
+
+def test_get_tasks_paginated_sorted_asc(client, five_tasks):
+    # Act
+    pages = read_all_pages(client, "/tasks", {"sort": "asc", "limit": 2})
+
+    # Assert
+    assert [(task["title"], task["id"]) for page in pages for task in page] == [
+        ("A task", 2), ("A task", 5), ("B task", 1), ("B task", 3), ("C task", 4)
+    ]
+
+
+def test_get_tasks_paginated_sorted_desc(client, five_tasks):
+    # Act
+    pages = read_all_pages(client, "/tasks", {"sort": "desc", "limit": 3})
+
+    # Assert
+    assert [len(page) for page in pages] == [3, 2]
+    assert [(task["title"], task["id"]) for page in pages for task in page] == [
+        ("C task", 4), ("B task", 3), ("B task", 1), ("A task", 5), ("A task", 2)
+    ]
+
+
+def test_get_tasks_limit_all_is_unpaginated(client, five_tasks):
+    # Act
+    response = client.get("/tasks?limit=all")
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert len(response_body) == 5
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_tasks_invalid_limit(client, five_tasks):
+    # Act
+    response = client.get("/tasks?limit=zero")
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"error": "zero is an invalid limit. Limit must be an integer or 'all'."}
+
+
+def test_get_tasks_cursor_from_other_sort_rejected(client, five_tasks):
+    # Arrange
+    next_cursor = client.get("/tasks?limit=2").headers["X-Next-Cursor"]
+
+    # Act
+    response = client.get("/tasks", query_string={"sort": "asc", "cursor": next_cursor})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"error": "invalid cursor"}
+
+
+@pytest.mark.parametrize("sort, expected", [
+    ("asc", [("A task", 2), ("A task", 5), ("B task", 1), ("B task", 3), ("C task", 4), (None, 6), (None, 7)]),
+    ("desc", [(None, 7), (None, 6), ("C task", 4), ("B task", 3), ("B task", 1), ("A task", 5), ("A task", 2)])
+])
+def test_get_tasks_paginated_sorted_with_null_titles(client, five_tasks, sort, expected):
+    # Arrange
+    client.post("/tasks", json={"title": None, "description": ""})
+    client.post("/tasks", json={"title": None, "description": ""})
+
+    # Act
+    pages = read_all_pages(client, "/tasks", {"sort": sort, "limit": 1})
+
+    # Assert
+    assert [(task["title"], task["id"]) for page in pages for task in page] == expected
+
+
+@pytest.mark.parametrize("sort, values", [
+    (None, [{"a": 1}]),
+    (None, ["1"]),
+    (None, [True]),
+    ("asc", [1, 1]),
+    ("asc", ["A task", None])
+])
+def test_get_tasks_cursor_with_invalid_values_rejected(client, five_tasks, sort, values):
+    # Act
+    response = client.get("/tasks", query_string={"sort": sort or "", "cursor": encode_cursor(sort, values)})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 400
+    assert response_body == {"error": "invalid cursor"}
+
+
+def test_search_cursor_with_invalid_rank_rejected(client, five_tasks):
+    # Act
+    response = client.get("/tasks/search", query_string={"q": "task", "cursor": encode_cursor("rank", ["best", 1])})
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "invalid cursor"}
+
+
+def test_get_goals_paginated(client):
+    # Arrange
+    db.session.add_all([Goal(title=f"Goal {i}") for i in range(3)])
+    db.session.commit()
+
+    # Act
+    pages = read_all_pages(client, "/goals", {"limit": 2})
+
+    # Assert
+    assert [[goal["id"] for goal in page] for page in pages] == [[1, 2], [3]]
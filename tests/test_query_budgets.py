@@ -0,0 +1,79 @@
+from app import db
+from app.models.task import Task
+from app.query_budget import QueryBudgetExceeded, query_budget
+import logging
+import pytest
+
+
+def test_every_route_has_a_query_budget(app):
+    # Act
+    endpoints = [rule.endpoint for rule in app.url_map.iter_rules()
+        if rule.endpoint.split(".")[0] in ("task", "goal")]
+
+    # Assert
+    assert len(endpoints) == 19
+    for endpoint in endpoints:
+        assert isinstance(getattr(app.view_functions[endpoint], "query_budget", None), int), endpoint
+
+
+@pytest.fixture
+def goal_with_many_tasks(app, one_goal):
+    db.session.add_all([Task(title=f"Task {i}", description="") for i in range(50)])
+    db.session.commit()
+
+
+# the routes raise QueryBudgetExceeded in testing mode, so these only pass
+# while their query counts stay flat as the number of tasks grows
+def test_goal_routes_stay_within_budget_with_many_tasks(client, goal_with_many_tasks):
+    # Act
+    assign_response = client.post("/goals/1/tasks", json={"task_ids": list(range(1, 51))})
+    read_response = client.get("/goals/1/tasks")
+    include_response = client.get("/goals?include=tasks")
+    delete_response = client.delete("/goals/1")
+
+    # Assert
+    assert assign_response.status_code == 200
+    assert len(read_response.get_json()["tasks"]) == 50
+    assert len(include_response.get_json()[0]["tasks"]) == 50
+    assert delete_response.status_code == 200
+
+
+def test_task_routes_stay_within_budget_with_many_tasks(client, goal_with_many_tasks):
+    # Act
+    list_response = client.get("/tasks?limit=all")
+    delete_response = client.delete("/tasks", json={"all": True})
+
+    # Assert
+    assert len(list_response.get_json()) == 50
+    assert delete_response.get_json()["count"] == 50
+
+
+@pytest.fixture
+def over_budget_route(app):
+    @query_budget(1)
+    def count_tasks_twice():
+        Task.query.count()
+        Task.query.count()
+        return {"ok": True}
+
+    app.add_url_rule("/over-budget", view_func=count_tasks_twice)
+
+
+def test_exceeding_budget_fails_request_in_testing(client, over_budget_route):
+    # Act / Assert
+    with pytest.raises(QueryBudgetExceeded, match="count_tasks_twice ran 2 SQL statements, its budget is 1"):
+        client.get("/over-budget")
+
+
+def test_exceeding_budget_logs_warning_in_production(app, client, over_budget_route, caplog):
+    # Arrange
+    app.testing = False
+
+    # Act
+    with caplog.at_level(logging.WARNING, logger="app.query_budget"):
+        response = client.get("/over-budget")
+
+    # Assert
+    assert response.status_code == 200
+    assert "count_tasks_twice ran 2 SQL statements, its budget is 1" in caplog.text
+    assert "SELECT count(*)" in caplog.text
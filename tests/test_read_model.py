@@ -0,0 +1,45 @@
+from app.models.task import Task
+from app.models.goal import Goal
+from sqlalchemy import event
+import pytest
+
+
+@pytest.fixture
+def loaded_instances():
+    loaded = []
+
+    def record(target, context):
+        loaded.append(target)
+
+    event.listen(Task, "load", record)
+    event.listen(Goal, "load", record)
+    yield loaded
+    event.remove(Task, "load", record)
+    event.remove(Goal, "load", record)
+
+
+@pytest.mark.parametrize("path", [
+    "/tasks",
+    "/tasks?sort=desc",
+    "/tasks?stream=1",
+    "/goals",
+    "/goals?stream=1"
+])
+def test_list_routes_do_not_load_orm_instances(client, one_task_belongs_to_one_goal, loaded_instances, path):
+    # Act
+    response = client.get(path)
+
+    # Assert
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+    assert loaded_instances == []
+
+
+def test_goal_tasks_route_loads_only_the_goal(client, one_task_belongs_to_one_goal, loaded_instances):
+    # Act
+    response = client.get("/goals/1/tasks")
+
+    # Assert
+    assert response.status_code == 200
+    assert len(response.get_json()["tasks"]) == 1
+    assert [type(instance) for instance in loaded_instances] == [Goal]
@@ -0,0 +1,105 @@
+from app import create_app, db
+from app.models.task import Task
+import pytest
+
+
+def create_replica_app(tmp_path, replica_uri=None, **config):
+    create_replica = replica_uri is None
+    replica_uri = replica_uri or f"sqlite:///{tmp_path}/replica.db"
+
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/primary.db",
+        "DATABASE_REPLICA_URIS": [replica_uri],
+        **config
+    })
+
+    # the primary and the replica hold different rows, so every response
+    # shows which database served it
+    with app.app_context():
+        db.create_all(bind=None)
+        db.session.add(Task(title="Primary task", description=""))
+        db.session.commit()
+
+        if create_replica:
+            replica = db.get_engine(app, bind="replica_0")
+            db.Model.metadata.create_all(bind=replica)
+            replica.execute(Task.__table__.insert(), {"title": "Replica task", "description": ""})
+
+    return app
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    return create_replica_app(tmp_path)
+
+
+def read_titles(client, path="/tasks"):
+    return [task["title"] for task in client.get(path).get_json()]
+
+
+def test_get_routes_read_from_replica(replica_app):
+    # Arrange
+    client = replica_app.test_client()
+
+    # Act
+    task_titles = read_titles(client)
+    task_response = client.get("/tasks/1")
+
+    # Assert
+    assert task_titles == ["Replica task"]
+    assert task_response.get_json()["task"]["title"] == "Replica task"
+
+
+def test_writes_go_to_primary_and_writer_reads_its_writes(replica_app):
+    # Arrange
+    client = replica_app.test_client()
+
+    # Act
+    response = client.post("/tasks", json={"title": "New task", "description": ""})
+    writer_titles = read_titles(client)
+    other_client_titles = read_titles(replica_app.test_client())
+
+    # Assert
+    assert response.status_code == 201
+    assert "read_primary_until" in response.headers["Set-Cookie"]
+    assert writer_titles == ["Primary task", "New task"]
+    assert other_client_titles == ["Replica task"]
+
+
+def test_failed_write_does_not_pin_client_to_primary(replica_app):
+    # Arrange
+    client = replica_app.test_client()
+
+    # Act
+    response = client.post("/tasks", json={})
+
+    # Assert
+    assert response.status_code == 400
+    assert "Set-Cookie" not in response.headers
+    assert read_titles(client) == ["Replica task"]
+
+
+def test_reads_return_to_replica_after_window(tmp_path):
+    # Arrange
+    app = create_replica_app(tmp_path, DATABASE_READ_YOUR_WRITES_SECONDS=0)
+    client = app.test_client()
+
+    # Act
+    client.post("/tasks", json={"title": "New task", "description": ""})
+
+    # Assert
+    assert read_titles(client) == ["Replica task"]
+
+
+def test_unavailable_replica_falls_back_to_primary(tmp_path):
+    # Arrange
+    app = create_replica_app(tmp_path, f"sqlite:///{tmp_path}/missing/replica.db")
+    client = app.test_client()
+
+    # Act
+    task_titles = read_titles(client)
+
+    # Assert
+    assert task_titles == ["Primary task"]
+    assert "replica_0" in app.extensions["replicas"].down_until
@@ -0,0 +1,84 @@
+from app import create_app, db
+from app.serializers import compile_plan, serialize_task_detail, StdlibJSON
+from app.models.task import Task
+from datetime import datetime
+from flask.signals import request_finished
+import pytest
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def json_app(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+
+    app = create_app({"TESTING": True, "JSON_BACKEND": request.param})
+
+    @request_finished.connect_via(app)
+    def expire_session(sender, response, **extra):
+        db.session.remove()
+
+    with app.app_context():
+        db.create_all()
+        yield app
+
+    with app.app_context():
+        db.drop_all()
+
+
+def test_routes_round_trip_with_json_backend(json_app):
+    # Arrange
+    client = json_app.test_client()
+
+    # Act
+    create_response = client.post("/tasks", json={"title": "Café ☕", "description": "Ünïcode"})
+    list_response = client.get("/tasks")
+    stream_response = client.get("/tasks?stream=1")
+
+    # Assert
+    assert create_response.status_code == 201
+    assert create_response.get_json() == {
+        "task": {"id": 1, "title": "Café ☕", "description": "Ünïcode", "is_complete": False}
+    }
+    assert list_response.get_json() == [create_response.get_json()["task"]]
+    assert stream_response.get_json() == list_response.get_json()
+
+
+def test_invalid_json_body(json_app):
+    # Arrange
+    client = json_app.test_client()
+
+    # Act
+    response = client.post("/tasks", data="{not json", content_type="application/json")
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"details": "Invalid data"}
+
+
+def test_unknown_json_backend_falls_back_to_stdlib():
+    # Act
+    app = create_app({"TESTING": True, "JSON_BACKEND": "missing"})
+
+    # Assert
+    assert isinstance(app.extensions["json_backend"], StdlibJSON)
+
+
+def test_compiled_plan_converts_fields():
+    # Arrange
+    serialize = compile_plan(("id", "task_id", None), ("is_complete", "completed_at", bool))
+
+    # Act
+    result = serialize(Task(task_id=3, completed_at=datetime(2022, 5, 9)))
+
+    # Assert
+    assert result == {"id": 3, "is_complete": True}
+
+
+def test_task_detail_includes_goal_only_when_set():
+    # Act
+    without_goal = serialize_task_detail(Task(task_id=1, title="", description="", completed_at=None))
+    with_goal = serialize_task_detail(Task(task_id=1, title="", description="", completed_at=None, goal_id=2))
+
+    # Assert
+    assert "goal_id" not in without_goal
+    assert with_goal["goal_id"] == 2
@@ -0,0 +1,26 @@
+from benchmarks.startup import DEFERRED_MODULES
+import json
+import os
+import subprocess
+import sys
+
+IMPORTED_MODULES_SCRIPT = """
+import json, sys
+from app import create_app
+create_app()
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def test_create_app_defers_imports():
+    # Arrange
+    env = dict(os.environ, MIGRATIONS_ENABLED="0", SQLALCHEMY_DATABASE_URI="sqlite://")
+
+    # Act
+    result = subprocess.run([sys.executable, "-c", IMPORTED_MODULES_SCRIPT],
+        env=env, capture_output=True, text=True, check=True)
+    modules = json.loads(result.stdout)
+
+    # Assert
+    assert [name for name in DEFERRED_MODULES if name in modules] == []
+
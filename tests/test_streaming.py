@@ -0,0 +1,67 @@
+import json
+import pytest
+
+
+def test_get_tasks_stream_json(client, three_tasks):
+    # Act
+    response = client.get("/tasks?stream=1&sort=asc")
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert [task["title"] for task in response_body] == [
+        "Answer forgotten email 📧",
+        "Pay my outstanding tickets 😭",
+        "Water the garden 🌷"
+    ]
+
+
+def test_get_tasks_stream_ndjson(client, three_tasks):
+    # Act
+    response = client.get("/tasks", headers={"Accept": "application/x-ndjson"})
+    lines = response.get_data(as_text=True).splitlines()
+
+    # Assert
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+
+
+def test_get_tasks_stream_no_saved_tasks(client):
+    # Act
+    response = client.get("/tasks?stream=1")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+
+def test_get_goals_stream_ndjson(client, one_goal):
+    # Act
+    response = client.get("/goals", headers={"Accept": "application/x-ndjson"})
+    lines = response.get_data(as_text=True).splitlines()
+
+    # Assert
+    assert response.status_code == 200
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "title": "Build a habit of going outside daily"}
+    ]
+
+
+def test_get_tasks_of_goal_stream_json_matches_unstreamed(client, one_task_belongs_to_one_goal):
+    # Act
+    response = client.get("/goals/1/tasks?stream=1")
+    unstreamed_response = client.get("/goals/1/tasks")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.get_json() == unstreamed_response.get_json()
+
+
+def test_get_tasks_of_goal_stream_not_found(client):
+    # Act
+    response = client.get("/goals/1/tasks?stream=1")
+
+    # Assert
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "goal 1 not found"}
@@ -0,0 +1,76 @@
+from app.models.task import Task
+from app.models.goal import Goal
+from app import db
+from datetime import datetime
+import pytest
+
+
+@pytest.fixture
+def filterable_tasks(app):
+    db.session.add(Goal(title="Goal"))
+    db.session.add_all([
+        Task(title="Water the garden", description="", completed_at=datetime(2022, 5, 1), goal_id=1),
+        Task(title="Wash the car", description="", completed_at=datetime(2022, 5, 20)),
+        Task(title="water_bottle 50%", description="", completed_at=None, goal_id=1),
+        Task(title="Pay tickets", description="", completed_at=None)
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize("query_string, expected_ids", [
+    ({"is_complete": "true"}, [1, 2]),
+    ({"is_complete": "false"}, [3, 4]),
+    ({"goal_id": "1"}, [1, 3]),
+    ({"goal_id": "1", "is_complete": "false"}, [3]),
+    ({"completed_after": "2022-05-10"}, [2]),
+    ({"completed_before": "2022-05-10"}, [1]),
+    ({"completed_after": "2022-04-01", "completed_before": "2022-06-01"}, [1, 2]),
+    ({"title_prefix": "Wa"}, [1, 2]),
+    ({"title_prefix": "Water"}, [1]),
+    ({"title_prefix": "water_"}, [3]),
+    ({"title_prefix": "water_bottle 50%"}, [3]),
+    ({"title_prefix": "W*"}, [])
+])
+def test_get_tasks_filtered(client, filterable_tasks, query_string, expected_ids):
+    # Act
+    response = client.get("/tasks", query_string=query_string)
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert [task["id"] for task in response_body] == expected_ids
+
+
+def test_get_tasks_filtered_and_sorted(client, filterable_tasks):
+    # Act
+    response = client.get("/tasks", query_string={"title_prefix": "W", "sort": "desc"})
+    response_body = response.get_json()
+
+    # Assert
+    assert response.status_code == 200
+    assert [task["title"] for task in response_body] == ["Water the garden", "Wash the car"]
+
+
+def test_get_tasks_filtered_pages(client, filterable_tasks):
+    # Act
+    first_page = client.get("/tasks", query_string={"is_complete": "false", "limit": 1})
+    second_page = client.get("/tasks", query_string={
+        "is_complete": "false", "limit": 1, "cursor": first_page.headers["X-Next-Cursor"]})
+
+    # Assert
+    assert [task["id"] for task in first_page.get_json()] == [3]
+    assert [task["id"] for task in second_page.get_json()] == [4]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+@pytest.mark.parametrize("query_string, error", [
+    ({"is_complete": "maybe"}, "is_complete must be true or false"),
+    ({"completed_before": "someday"}, "someday is an invalid completed_before date")
+])
+def test_get_tasks_invalid_filter(client, filterable_tasks, query_string, error):
+    # Act
+    response = client.get("/tasks", query_string=query_string)
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"details": error}
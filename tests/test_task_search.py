@@ -0,0 +1,140 @@
+from app.models.task import Task
+from app import db
+import pytest
+
+
+@pytest.fixture
+def searchable_tasks(app):
+    db.session.add_all([
+        Task(title="Water the garden", description="Tomatoes need watering every morning"),
+        Task(title="Buy groceries", description="Tomatoes, basil and bread"),
+        Task(title="Call grandma", description="Ask about the garden party"),
+        Task(title="Fix 50% of the \"bugs\"", description="")
+    ])
+    db.session.commit()
+
+
+def search(client, **query_string):
+    response = client.get("/tasks/search", query_string=query_string)
+    return response, [task["id"] for task in response.get_json()]
+
+
+def test_search_matches_title_and_description(client, searchable_tasks):
+    # Act
+    response, task_ids = search(client, q="tomatoes")
+
+    # Assert
+    assert response.status_code == 200
+    assert sorted(task_ids) == [1, 2]
+
+
+def test_search_ranks_title_matches_first(client, searchable_tasks):
+    # Act
+    response, task_ids = search(client, q="garden")
+
+    # Assert
+    assert response.status_code == 200
+    assert task_ids == [1, 3]
+    assert response.get_json()[0] == {
+        "id": 1,
+        "title": "Water the garden",
+        "description": "Tomatoes need watering every morning",
+        "is_complete": False
+    }
+
+
+def test_search_requires_every_word(client, searchable_tasks):
+    # Act
+    _, task_ids = search(client, q="garden party")
+
+    # Assert
+    assert task_ids == [3]
+
+
+def test_search_treats_query_syntax_literally(client, searchable_tasks):
+    # Act
+    response, task_ids = search(client, q='"bugs" OR NEAR(')
+
+    # Assert
+    assert response.status_code == 200
+    assert task_ids == []
+
+
+def test_search_no_matches(client, searchable_tasks):
+    # Act
+    response, task_ids = search(client, q="homework")
+
+    # Assert
+    assert response.status_code == 200
+    assert task_ids == []
+
+
+def test_search_requires_query(client):
+    # Act
+    response = client.get("/tasks/search", query_string={"q": "  "})
+
+    # Assert
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "q is required"}
+
+
+def test_search_pages(client, searchable_tasks):
+    # Act
+    first_page, first_ids = search(client, q="tomatoes", limit=1)
+    second_page, second_ids = search(client, q="tomatoes", limit=1,
+        cursor=first_page.headers["X-Next-Cursor"])
+
+    # Assert
+    assert sorted(first_ids + second_ids) == [1, 2]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_search_applies_filters(client, searchable_tasks):
+    # Arrange
+    client.patch("/tasks/2/mark_complete")
+
+    # Act
+    _, task_ids = search(client, q="tomatoes", is_complete="false")
+
+    # Assert
+    assert task_ids == [1]
+
+
+def test_search_follows_updates_and_deletes(client, searchable_tasks):
+    # Act
+    client.put("/tasks/1", json={"title": "Mow the lawn", "description": "Before noon"})
+    client.delete("/tasks/2")
+    _, tomato_ids = search(client, q="tomatoes")
+    _, lawn_ids = search(client, q="lawn")
+
+    # Assert
+    assert tomato_ids == []
+    assert lawn_ids == [1]
+
+
+def test_search_follows_bulk_writes(client, searchable_tasks):
+    # Act
+    client.post("/tasks/bulk", json=[
+        {"title": "Plant tomatoes", "description": ""},
+        {"title": "Paint the fence", "description": ""}
+    ])
+    client.delete("/tasks", json={"task_ids": [1]})
+    _, task_ids = search(client, q="tomatoes")
+
+    # Assert
+    assert sorted(task_ids) == [2, 5]
+
+
+def test_postgresql_rank_is_double_precision(app, monkeypatch):
+    # Arrange: build the PostgreSQL query without a PostgreSQL server
+    from app.search import query_search_matches
+    from sqlalchemy.dialects import postgresql
+    dialect = postgresql.dialect()
+    monkeypatch.setattr(db.session, "get_bind", lambda *args, **kwargs: type("Bind", (), {"dialect": dialect}))
+
+    # Act
+    statement = str(query_search_matches("garden").statement.compile(dialect=dialect))
+
+    # Assert
+    assert "CAST(-ts_rank(task.search_vector, websearch_to_tsquery(" in statement
+    assert "AS FLOAT(53)) AS rank" in statement
@@ -0,0 +1,78 @@
+from app.models.task import Task
+from app.models.goal import Goal
+from sqlalchemy import event
+import pytest
+
+
+@pytest.fixture
+def loaded_instances():
+    loaded = []
+
+    def record(target, context):
+        loaded.append(target)
+
+    event.listen(Task, "load", record)
+    event.listen(Goal, "load", record)
+    yield loaded
+    event.remove(Task, "load", record)
+    event.remove(Goal, "load", record)
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("put", "/tasks/1", {"title": "Updated", "description": "Updated description"}),
+    ("patch", "/tasks/1/mark_complete", None),
+    ("patch", "/tasks/1/mark_incomplete", None),
+    ("delete", "/tasks/1", None),
+    ("put", "/goals/1", {"title": "Updated goal"}),
+    ("delete", "/goals/1", None)
+])
+def test_write_routes_do_not_load_orm_instances(client, one_task_belongs_to_one_goal, loaded_instances,
+        method, path, body):
+    # Act
+    response = getattr(client, method)(path, json=body)
+
+    # Assert
+    assert response.status_code == 200
+    assert loaded_instances == []
+
+
+@pytest.mark.parametrize("method, path, body, error", [
+    ("put", "/tasks/1", {"title": "Updated", "description": ""}, "task 1 not found"),
+    ("patch", "/tasks/1/mark_complete", None, "task 1 not found"),
+    ("patch", "/tasks/1/mark_incomplete", None, "task 1 not found"),
+    ("delete", "/tasks/1", None, "task 1 not found"),
+    ("put", "/goals/1", {"title": "Updated goal"}, "goal 1 not found"),
+    ("delete", "/goals/1", None, "goal 1 not found")
+])
+def test_write_routes_not_found(client, method, path, body, error):
+    # Act
+    response = getattr(client, method)(path, json=body)
+
+    # Assert
+    assert response.status_code == 404
+    assert response.get_json() == {"error": error}
+
+
+def test_delete_goal_detaches_its_tasks(client, one_task_belongs_to_one_goal):
+    # Act
+    response = client.delete("/goals/1")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.get_json() == {"details": 'Goal 1 "Build a habit of going outside daily" successfully deleted'}
+    assert Goal.query.get(1) is None
+    assert Task.query.get(1).goal_id is None
+
+
+def test_mark_complete_returns_updated_row(client, one_task_belongs_to_one_goal):
+    # Act
+    response = client.patch("/tasks/1/mark_complete")
+
+    # Assert
+    assert response.get_json() == {"task": {
+        "id": 1,
+        "goal_id": 1,
+        "title": "Go on my daily walk 🏞",
+        "description": "Notice something new every day",
+        "is_complete": True
+    }}